@@ -433,15 +433,18 @@ def sanitize_single_file(file_path: str, output_dir: str, cli: CLIView, include_
             # Export to database if requested
             if db_exporter:
                 try:
+                    # All of this file's database writes, recurring detection included, share one transaction and one commit
+                    db_exporter.begin_batch()
+                    
                     # Check if file already imported (unless force re-import)
                     if not force_reimport and db_exporter.is_file_imported(file_path):
                         if cli.verbose:
                             cli.print(f"  File already imported to database (use --force-reimport to re-import)", MessageLevel.DEBUG)
                     else:
-                        # Delete existing transactions if re-importing
-                        if force_reimport and db_exporter.is_file_imported(file_path):
+                        # Delete existing transactions if re-importing (no-op for files never imported)
+                        if force_reimport:
                             deleted = db_exporter.delete_file_transactions(file_path)
-                            if cli.verbose:
+                            if deleted and cli.verbose:
                                 cli.print(f"  Removed {deleted} existing transactions for re-import", MessageLevel.DEBUG)
                         
                         # Try to extract tax documents first (for PDF/TXT files)
@@ -535,7 +538,10 @@ def sanitize_single_file(file_path: str, output_dir: str, cli: CLIView, include_
                                     cli.print(f"  Exported {result['inserted']} transactions to database", MessageLevel.DEBUG)
                                     if result['skipped'] > 0:
                                         cli.print(f"  Skipped {result['skipped']} duplicate transactions", MessageLevel.DEBUG)
+                    
+                    db_exporter.end_batch()
                 except Exception as e:
+                    db_exporter.end_batch(commit=False)
                     if cli.verbose:
                         cli.print(f"  Warning: Failed to export to database: {e}", MessageLevel.WARNING)
         else:
@@ -718,15 +724,18 @@ def sanitize_files(input_dir: str, output_dir: str, cli: CLIView, include_metada
                 # Export to database if requested
                 if db_exporter:
                     try:
+                        # All of this file's database writes, recurring detection included, share one transaction and one commit
+                        db_exporter.begin_batch()
+                        
                         # Check if file already imported (unless force re-import)
                         if not force_reimport and db_exporter.is_file_imported(file_path):
                             if cli.verbose:
                                 cli.print(f"  File already imported to database (use --force-reimport to re-import)", MessageLevel.DEBUG)
                         else:
-                            # Delete existing transactions if re-importing
-                            if force_reimport and db_exporter.is_file_imported(file_path):
+                            # Delete existing transactions if re-importing (no-op for files never imported)
+                            if force_reimport:
                                 deleted = db_exporter.delete_file_transactions(file_path)
-                                if cli.verbose:
+                                if deleted and cli.verbose:
                                     cli.print(f"  Removed {deleted} existing transactions for re-import", MessageLevel.DEBUG)
                             
                             # Try to extract tax documents first (for PDF/TXT files)
@@ -820,7 +829,10 @@ def sanitize_files(input_dir: str, output_dir: str, cli: CLIView, include_metada
                                         cli.print(f"  Exported {result['inserted']} transactions to database", MessageLevel.DEBUG)
                                         if result['skipped'] > 0:
                                             cli.print(f"  Skipped {result['skipped']} duplicate transactions", MessageLevel.DEBUG)
+                        
+                        db_exporter.end_batch()
                     except Exception as e:
+                        db_exporter.end_batch(commit=False)
                         if cli.verbose:
                             cli.print(f"  Warning: Failed to export to database: {e}", MessageLevel.WARNING)
             else:
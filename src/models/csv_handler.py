@@ -64,17 +64,16 @@ class CSVHandler:
         all_detected_patterns = set()
         
         for row in rows:
-            sanitized_row = {}
-            for key, value in row.items():
-                if value:
-                    # Sanitize the value
-                    sanitized_value, detected_patterns = sanitizer.sanitize_text(
-                        str(value), track_patterns=True
-                    )
-                    all_detected_patterns.update(detected_patterns)
-                    sanitized_row[key] = sanitized_value
-                else:
-                    sanitized_row[key] = value
+            # Copy the row as-is so empty cells pass through untouched,
+            # then overwrite only the non-empty cells with sanitized values
+            sanitized_row = dict(row)
+            non_empty_items = [(key, value) for key, value in row.items() if value]
+            for key, value in non_empty_items:
+                sanitized_value, detected_patterns = sanitizer.sanitize_text(
+                    str(value), track_patterns=True
+                )
+                all_detected_patterns.update(detected_patterns)
+                sanitized_row[key] = sanitized_value
             sanitized_rows.append(sanitized_row)
         
         return sanitized_rows, all_detected_patterns
@@ -6,10 +6,19 @@ Exports sanitized financial data to SQLite database for tax analysis and AI revi
 import sqlite3
 import os
 import json
+import copy
+import contextlib
+import functools
+import itertools
+from collections import namedtuple
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Iterator, Union
+import operator
 import re
 
+import numpy as np
+import pandas as pd
+
 from src.models.transaction_categorizer import TransactionCategorizer
 from src.models.merchant_extractor import MerchantExtractor
 from src.models.paystub_extractor import PaystubExtractor
@@ -18,17 +27,490 @@ from src.models.investment_extractor import InvestmentExtractor
 from src.models.tax_extractor import TaxDocumentExtractor
 
 
+# Maximum number of rows sent to a single executemany() call
+INSERT_BATCH_SIZE = 5000
+
+# Older SQLite builds cap bound parameters per statement at 999
+MAX_SQL_VARIABLES = 900
+
+# Shared by every transaction insert path so the connection's statement cache
+# always sees the same SQL text. transaction_type is derived from the amount
+# (?3) by SQLite so it can never disagree with the sign of the stored amount.
+INSERT_TRANSACTION_SQL = """
+    INSERT INTO transactions 
+    (source_file, transaction_date, amount, description, merchant_name, category, 
+     account_type, bank_name, transaction_type, reference_number, notes, is_recurring)
+    VALUES (?1, ?2, ?3, substr(?4, 1, 500), ?5, ?6, ?7, ?8,
+            CASE WHEN ?3 < 0 THEN 'debit' WHEN ?3 IS NOT NULL THEN 'credit' END,
+            ?9, ?10, ?11)
+"""
+
+# Drops only exact duplicates under idx_tx_unique (see create_schema); any other
+# constraint failure still raises. Usable only once that index exists.
+TRANSACTION_CONFLICT_CLAUSE = """
+    ON CONFLICT (source_file, transaction_date, amount, description) DO NOTHING
+"""
+INSERT_TRANSACTION_SKIP_DUPLICATES_SQL = INSERT_TRANSACTION_SQL.rstrip() + TRANSACTION_CONFLICT_CLAUSE
+
+# Dates and amounts in sanitized statement text, matched in a single pass.
+# Amounts must carry cents so date fragments and counts aren't picked up.
+TRANSACTION_TOKEN_PATTERN = re.compile(
+    r'(?P<date>\d{1,2}[/-]\d{1,2}[/-]\d{2,4})|\$?(?P<amount>[\d,]+\.\d{2})'
+)
+
+# Statement dates, normalized to ISO YYYY-MM-DD before storage so they sort
+# and compare correctly. Numeric dates are month-first, as on US statements.
+US_DATE_PATTERN = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4}|\d{2})')
+ISO_DATE_PATTERN = re.compile(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})(?:[ T]00:00:00)?')
+
+# Every date or amount token contains a digit; lines without one skip the token scan
+DIGIT_PATTERN = re.compile(r'\d')
+
+# Non-empty lines of a text blob, scanned lazily instead of splitting into a list
+LINE_PATTERN = re.compile(r'[^\n]+')
+
+# Transaction fields supplied by callers, in INSERT_TRANSACTION_SQL parameter order
+TRANSACTION_FIELDS = (
+    'source_file', 'transaction_date', 'amount', 'description', 'merchant_name', 'category',
+    'account_type', 'bank_name', 'reference_number', 'notes', 'is_recurring'
+)
+
+# Compact transaction record for bulk callers. Its fields are exactly the
+# INSERT_TRANSACTION_SQL parameters, so it is bound as-is without per-field lookups.
+Transaction = namedtuple(
+    'Transaction', TRANSACTION_FIELDS,
+    defaults=(None,) * (len(TRANSACTION_FIELDS) - 2) + (0,)
+)
+
+# Builds the INSERT_TRANSACTION_SQL parameter tuple from a transaction dict in C
+TRANSACTION_ROW = operator.itemgetter(*TRANSACTION_FIELDS)
+TRANSACTION_DEFAULTS = {**dict.fromkeys(TRANSACTION_FIELDS), 'is_recurring': 0}
+
+# Common CSV/Excel column name mappings, in order of preference
+DATE_COLUMNS = ('date', 'transaction_date', 'post_date', 'posted_date')
+AMOUNT_COLUMNS = ('amount', 'transaction_amount', 'debit', 'credit', 'balance')
+DESCRIPTION_COLUMNS = ('description', 'memo', 'details', 'transaction_description')
+ACCOUNT_TYPE_COLUMNS = ('account_type', 'account', 'account_name', 'account_description')
+
+# Characters removed from CSV amount cells before float conversion
+AMOUNT_STRIP_TABLE = str.maketrans('', '', '$, \t\r\n')
+
+# Known bank/issuer patterns (order matters - more specific first), compiled once
+BANK_NAME_PATTERNS = {
+    'American Express': (
+        re.compile(r'american\s+express'),
+        re.compile(r'amex'),
+        re.compile(r'\bamex\b'),
+    ),
+    'Discover': (
+        re.compile(r'discover\s+(?:card|bank|financial)'),
+        re.compile(r'\bdiscover\b'),
+    ),
+    'Charles Schwab': (
+        re.compile(r'charles\s+schwab'),
+        re.compile(r'schwab\s+(?:bank|investor)'),
+        re.compile(r'\bschwab\b'),
+    ),
+    'Chase': (
+        re.compile(r'chase\s+(?:bank|card|sapphire)'),
+        re.compile(r'\bchase\b'),
+    ),
+    'Bank of America': (
+        re.compile(r'bank\s+of\s+america'),
+        re.compile(r'\bbofa\b'),
+        re.compile(r'\bbankofamerica\b'),
+    ),
+    'Wells Fargo': (
+        re.compile(r'wells\s+fargo'),
+    ),
+    'Citibank': (
+        re.compile(r'citi\s+(?:bank|card)'),
+        re.compile(r'\bcitibank\b'),
+    ),
+    'Capital One': (
+        re.compile(r'capital\s+one'),
+    ),
+    'US Bank': (
+        re.compile(r'us\s+bank'),
+        re.compile(r'\busbank\b'),
+    ),
+    'PNC': (
+        re.compile(r'\bpnc\s+(?:bank|card)'),
+    ),
+    'TD Bank': (
+        re.compile(r'td\s+bank'),
+    ),
+    'Ally Bank': (
+        re.compile(r'ally\s+bank'),
+    ),
+}
+
+# Common statement headers naming the issuer, tried when no known bank matches
+BANK_HEADER_PATTERNS = (
+    re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:card|bank|statement|account)'),
+    re.compile(r'statement\s+from\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'),
+)
+
+# Account type indicators in statement text
+ACCOUNT_TYPE_PATTERNS = {
+    'checking': (
+        re.compile(r'checking\s+account'),
+        re.compile(r'checking\s+statement'),
+        re.compile(r'demand\s+deposit'),
+    ),
+    'savings': (
+        re.compile(r'savings\s+account'),
+        re.compile(r'savings\s+statement'),
+    ),
+    'credit_card': (
+        re.compile(r'credit\s+card'),
+        re.compile(r'card\s+statement'),
+        re.compile(r'cardmember\s+statement'),
+        re.compile(r'account\s+summary'),
+        re.compile(r'payment\s+due'),
+        re.compile(r'minimum\s+payment'),
+        re.compile(r'available\s+credit'),
+        re.compile(r'credit\s+limit'),
+    ),
+    'roth_ira': (
+        re.compile(r'roth\s+ira'),
+        re.compile(r'roth\s+individual\s+retirement'),
+    ),
+    'traditional_ira': (
+        re.compile(r'traditional\s+ira'),
+        re.compile(r'rollover\s+ira'),
+        re.compile(r'ira\s+account'),
+        re.compile(r'individual\s+retirement\s+account'),
+    ),
+    'investment_account': (
+        re.compile(r'investment\s+account'),
+        re.compile(r'brokerage\s+account'),
+        re.compile(r'securities\s+account'),
+        re.compile(r'trading\s+account'),
+        re.compile(r'portfolio\s+statement'),
+    ),
+}
+
+
+# Full schema, run as one script. Every statement is idempotent.
+SCHEMA_SQL = """
+    -- Transactions table - main table for all financial transactions
+    CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT NOT NULL,
+        transaction_date TEXT,
+        amount REAL,
+        description TEXT,
+        merchant_name TEXT,
+        category TEXT,
+        account_type TEXT,
+        bank_name TEXT,
+        transaction_type TEXT,
+        reference_number TEXT,
+        notes TEXT,
+        is_recurring INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Files table - track which files have been imported
+    CREATE TABLE IF NOT EXISTS imported_files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        file_path TEXT UNIQUE NOT NULL,
+        file_type TEXT,
+        import_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        row_count INTEGER,
+        notes TEXT
+    );
+
+    -- Metadata table - store sanitization metadata
+    CREATE TABLE IF NOT EXISTS metadata (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        key TEXT UNIQUE NOT NULL,
+        value TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Paystubs table - store income/payroll data
+    CREATE TABLE IF NOT EXISTS paystubs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT NOT NULL,
+        pay_date TEXT,
+        pay_period_start TEXT,
+        pay_period_end TEXT,
+        employer_name TEXT,
+        gross_pay REAL,
+        regular_hours REAL,
+        overtime_hours REAL,
+        regular_rate REAL,
+        overtime_rate REAL,
+        bonus REAL,
+        commission REAL,
+        deductions_json TEXT,
+        total_deductions REAL,
+        net_pay REAL,
+        ytd_gross REAL,
+        ytd_net REAL,
+        ytd_taxes REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Create indexes for common queries
+    CREATE INDEX IF NOT EXISTS idx_transaction_date ON transactions(transaction_date);
+    -- Covering index so date-grouped amount aggregates never touch the table
+    CREATE INDEX IF NOT EXISTS idx_tx_date_amount ON transactions(transaction_date, amount);
+    -- Amount alone is rarely selective; amount filters come with a date or
+    -- category, which the composite indexes cover
+    DROP INDEX IF EXISTS idx_amount;
+    -- Category filters come with a date range and sum amounts (query_transactions,
+    -- budget status, category trends); the composite index supersedes idx_category
+    DROP INDEX IF EXISTS idx_category;
+    CREATE INDEX IF NOT EXISTS idx_cat_date ON transactions(category, transaction_date, amount);
+    CREATE INDEX IF NOT EXISTS idx_source_file ON transactions(source_file);
+    CREATE INDEX IF NOT EXISTS idx_account_type ON transactions(account_type);
+    CREATE INDEX IF NOT EXISTS idx_paystub_date ON paystubs(pay_date);
+    CREATE INDEX IF NOT EXISTS idx_paystub_source ON paystubs(source_file);
+    CREATE INDEX IF NOT EXISTS idx_paystub_employer ON paystubs(employer_name);
+
+    -- Account balances table - track account balances over time
+    CREATE TABLE IF NOT EXISTS account_balances (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT NOT NULL,
+        statement_date TEXT,
+        balance REAL NOT NULL,
+        available_credit REAL,
+        credit_limit REAL,
+        minimum_payment REAL,
+        payment_due_date TEXT,
+        apr REAL,
+        account_type TEXT,
+        bank_name TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_balance_date ON account_balances(statement_date);
+    CREATE INDEX IF NOT EXISTS idx_balance_source ON account_balances(source_file);
+    CREATE INDEX IF NOT EXISTS idx_balance_bank ON account_balances(bank_name);
+    CREATE INDEX IF NOT EXISTS idx_balance_type ON account_balances(account_type);
+
+    -- Bills table - track recurring bills and payments
+    CREATE TABLE IF NOT EXISTS bills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        merchant_name TEXT NOT NULL,
+        category TEXT,
+        amount REAL,
+        due_date TEXT,
+        frequency TEXT,
+        is_active INTEGER DEFAULT 1,
+        last_paid_date TEXT,
+        next_due_date TEXT,
+        payment_count INTEGER DEFAULT 0,
+        total_paid REAL DEFAULT 0,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_bill_merchant ON bills(merchant_name);
+    CREATE INDEX IF NOT EXISTS idx_bill_due_date ON bills(next_due_date);
+    CREATE INDEX IF NOT EXISTS idx_bill_active ON bills(is_active);
+
+    -- Investment accounts table - track investment account information
+    CREATE TABLE IF NOT EXISTS investment_accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT NOT NULL,
+        account_type TEXT NOT NULL,
+        bank_name TEXT,
+        account_name TEXT,
+        statement_date TEXT,
+        portfolio_value REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Holdings table - track securities positions
+    CREATE TABLE IF NOT EXISTS holdings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        investment_account_id INTEGER,
+        source_file TEXT NOT NULL,
+        statement_date TEXT,
+        ticker TEXT,
+        security_name TEXT,
+        quantity REAL,
+        market_value REAL,
+        cost_basis REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (investment_account_id) REFERENCES investment_accounts(id)
+    );
+
+    -- Investment transactions table - track buys, sells, dividends, etc.
+    CREATE TABLE IF NOT EXISTS investment_transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        investment_account_id INTEGER,
+        source_file TEXT NOT NULL,
+        transaction_date TEXT,
+        transaction_type TEXT NOT NULL,
+        security_ticker TEXT,
+        security_name TEXT,
+        quantity REAL,
+        price REAL,
+        amount REAL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (investment_account_id) REFERENCES investment_accounts(id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_investment_account_type ON investment_accounts(account_type);
+    CREATE INDEX IF NOT EXISTS idx_investment_bank ON investment_accounts(bank_name);
+    CREATE INDEX IF NOT EXISTS idx_investment_date ON investment_accounts(statement_date);
+    CREATE INDEX IF NOT EXISTS idx_holding_ticker ON holdings(ticker);
+    CREATE INDEX IF NOT EXISTS idx_holding_date ON holdings(statement_date);
+    CREATE INDEX IF NOT EXISTS idx_inv_trans_type ON investment_transactions(transaction_type);
+    CREATE INDEX IF NOT EXISTS idx_inv_trans_date ON investment_transactions(transaction_date);
+    CREATE INDEX IF NOT EXISTS idx_inv_trans_ticker ON investment_transactions(security_ticker);
+
+    -- Tax documents table - track tax forms (1099-INT, 1099-DIV, 1099-B, W-2)
+    CREATE TABLE IF NOT EXISTS tax_documents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT NOT NULL,
+        document_type TEXT NOT NULL,
+        tax_year INTEGER,
+        payer_name TEXT,
+        employer_name TEXT,
+        interest_income REAL,
+        ordinary_dividends REAL,
+        qualified_dividends REAL,
+        total_capital_gain REAL,
+        proceeds REAL,
+        cost_basis REAL,
+        gain_loss REAL,
+        wages REAL,
+        federal_tax_withheld REAL,
+        social_security_wages REAL,
+        social_security_tax REAL,
+        medicare_wages REAL,
+        medicare_tax REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_tax_doc_type ON tax_documents(document_type);
+    CREATE INDEX IF NOT EXISTS idx_tax_doc_year ON tax_documents(tax_year);
+    CREATE INDEX IF NOT EXISTS idx_tax_doc_source ON tax_documents(source_file);
+
+    -- Budgets table - track monthly budgets by category
+    CREATE TABLE IF NOT EXISTS budgets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL,
+        month TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        budget_amount REAL NOT NULL,
+        is_active INTEGER DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(category, month, year)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_budget_category ON budgets(category);
+    CREATE INDEX IF NOT EXISTS idx_budget_month_year ON budgets(year, month);
+    CREATE INDEX IF NOT EXISTS idx_budget_active ON budgets(is_active);
+
+    -- Financial goals table - track financial goals and progress
+    CREATE TABLE IF NOT EXISTS financial_goals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        goal_name TEXT NOT NULL,
+        goal_type TEXT NOT NULL,
+        target_amount REAL NOT NULL,
+        current_amount REAL DEFAULT 0,
+        target_date TEXT,
+        start_date TEXT,
+        description TEXT,
+        is_active INTEGER DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_goal_type ON financial_goals(goal_type);
+    CREATE INDEX IF NOT EXISTS idx_goal_active ON financial_goals(is_active);
+    CREATE INDEX IF NOT EXISTS idx_goal_target_date ON financial_goals(target_date);
+"""
+
+# Generated columns need SQLite 3.31+; older builds skip month_key entirely
+HAS_GENERATED_COLUMNS = sqlite3.sqlite_version_info >= (3, 31, 0)
+
+# Columns added to transactions after the first release (migrations).
+# Each fails with a "duplicate column" OperationalError once the column exists.
+TRANSACTION_COLUMN_MIGRATIONS = (
+    "ALTER TABLE transactions ADD COLUMN merchant_name TEXT",
+    "ALTER TABLE transactions ADD COLUMN is_recurring INTEGER DEFAULT 0",
+    "ALTER TABLE transactions ADD COLUMN tags TEXT",
+    "ALTER TABLE transactions ADD COLUMN bank_name TEXT",
+)
+
+# Indexed month of transaction_date, grouped on by the summary report
+MONTH_KEY_MIGRATIONS = (
+    """
+    ALTER TABLE transactions ADD COLUMN month_key TEXT
+    GENERATED ALWAYS AS (strftime('%Y-%m', transaction_date)) VIRTUAL
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_month_key ON transactions(month_key, amount)",
+)
+
+# Exact-duplicate guard for transactions, probed in C by the inserts' ON CONFLICT
+# clause. Created separately: it cannot be built over a database that already
+# holds duplicates, in which case dedupe falls back to the Python-side checks.
+TRANSACTION_UNIQUE_INDEX_SQL = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_tx_unique
+    ON transactions(source_file, transaction_date, amount, description)
+"""
+
+# PRAGMA user_version recorded once stored transaction dates have been
+# rewritten as ISO, so later connections skip the table scan
+DATES_NORMALIZED_USER_VERSION = 1
+
+# Indexes on migrated columns, created once the migrations above have run
+MIGRATED_COLUMN_INDEXES_SQL = """
+    -- Merchant lookups read a merchant's rows in date order; supersedes idx_merchant_name
+    DROP INDEX IF EXISTS idx_merchant_name;
+    CREATE INDEX IF NOT EXISTS idx_merchant_date ON transactions(merchant_name, transaction_date);
+    -- Duplicate checks match date and merchant exactly and amount within a tolerance
+    CREATE INDEX IF NOT EXISTS idx_tx_dup ON transactions(transaction_date, merchant_name, amount);
+    -- Recurring reports scan is_recurring = 1 rows by merchant, newest first;
+    -- supersedes idx_is_recurring
+    DROP INDEX IF EXISTS idx_is_recurring;
+    CREATE INDEX IF NOT EXISTS idx_recurring_merchant_date
+    ON transactions(is_recurring, merchant_name, transaction_date DESC, amount);
+    CREATE INDEX IF NOT EXISTS idx_bank_name ON transactions(bank_name);
+"""
+
+
 class DatabaseExporter:
     """Exports sanitized financial data to SQLite database."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, journal_mode: str = 'WAL', synchronous: str = 'NORMAL',
+                 cache_size: int = -65536, mmap_size: int = 268435456):
         """Initialize the database exporter.
         
         Args:
             db_path: Path to the SQLite database file
+            journal_mode: SQLite journal mode (ignored for in-memory databases)
+            synchronous: SQLite synchronous level
+            cache_size: SQLite page cache size (negative values are KiB)
+            mmap_size: Bytes of the database file to memory-map for reads (0 disables)
         """
         self.db_path = db_path
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
         self.conn = None
+        self._stats_cache = None  # ((total_changes, data_version), stats) from the last get_statistics()
+        self._pending_recurring_files = set()  # Files awaiting finalize_recurring()
+        self._open_batches = []  # (savepoint or None, pending files to restore on rollback) per begin_batch()
+        self._has_unique_index = None  # Whether idx_tx_unique exists; looked up on first insert
+        self._unique_index_failed = False  # Build already failed on existing duplicates
         self.categorizer = TransactionCategorizer()
         self.merchant_extractor = MerchantExtractor()
         self.paystub_extractor = PaystubExtractor()
@@ -39,309 +521,267 @@ class DatabaseExporter:
     def connect(self):
         """Connect to the database."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # Autocommit mode: transactions are opened explicitly with _transaction()
+            # rather than implicitly before each data-modifying statement
+            self.conn = sqlite3.connect(self.db_path, cached_statements=256, isolation_level=None)
+            self._stats_cache = None  # Both counters restart with each connection
+            self._has_unique_index = None
+            self._open_batches = []  # Batches never outlive their connection
             self.conn.row_factory = sqlite3.Row  # Enable column access by name
+            
+            # WAL + NORMAL sync avoids an fsync of the rollback journal on every
+            # commit and lets readers proceed during bulk imports
+            if self.db_path != ':memory:':
+                self.conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+                self.conn.execute("PRAGMA wal_autocheckpoint=1000")
+            self.conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute(f"PRAGMA cache_size={int(self.cache_size)}")  # Default 64 MiB page cache
+            # Memory-mapped reads skip a syscall and copy per page on large scans;
+            # writes still go through the normal pager path
+            self.conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")  # Default 256 MiB
+            self.conn.execute("PRAGMA busy_timeout=5000")
             return True
         except Exception as e:
             print(f"Error connecting to database: {e}")
             return False
     
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Run the enclosed statements as one explicit write transaction.
+        
+        Nested use (e.g. inside begin_batch()) runs as a savepoint of the outer
+        transaction. Rolls back the enclosed statements if an exception escapes.
+        """
+        if self.conn.in_transaction:
+            self.conn.execute("SAVEPOINT nested_write")
+            try:
+                yield
+            except BaseException:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK TO nested_write")
+                    self.conn.execute("RELEASE nested_write")
+                self._stats_cache = None  # Cache key doesn't move on rollback
+                raise
+            if self.conn.in_transaction:
+                self.conn.execute("RELEASE nested_write")
+            return
+        
+        # IMMEDIATE takes the write lock before the block's first read (e.g. the
+        # duplicate checks), so a concurrent writer makes it wait on the busy
+        # timeout here instead of failing the lock upgrade mid-transaction
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            self._stats_cache = None  # Cache key doesn't move on rollback
+            raise
+        # A statement in the block may already have ended the transaction
+        if self.conn.in_transaction:
+            self.conn.execute("COMMIT")
+    
+    @contextlib.contextmanager
+    def _read_transaction(self):
+        """Run the enclosed queries against one consistent snapshot.
+        
+        Several SELECTs issued in autocommit mode each take and drop the shared
+        lock, and another connection may commit between them. A deferred
+        transaction takes the lock once and pins one snapshot for all of them.
+        Inside an open transaction the enclosed queries simply join it.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        
+        self.conn.execute("BEGIN DEFERRED")
+        try:
+            yield
+        finally:
+            if self.conn.in_transaction:
+                self.conn.execute("COMMIT")
+    
+    def begin_batch(self):
+        """Open one write transaction spanning several calls (e.g. a whole file import).
+        
+        Writes made until end_batch() share a single commit. BEGIN IMMEDIATE takes
+        the write lock up front, so a busy database fails here rather than mid-batch.
+        Inside an open transaction (another batch or a _transaction() block) the
+        batch runs as a savepoint, so end_batch() never finishes the caller's
+        transaction.
+        """
+        if self.conn.in_transaction:
+            savepoint = f"batch_{len(self._open_batches)}"
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+        else:
+            savepoint = None
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._open_batches.append((savepoint, set(self._pending_recurring_files)))
+    
+    def end_batch(self, commit: bool = True):
+        """Finish the transaction or savepoint opened by the matching begin_batch().
+        
+        Args:
+            commit: If False, roll the batch back instead of committing it
+        """
+        if not self._open_batches:
+            return
+        savepoint, pending_recurring_files = self._open_batches.pop()
+        
+        if self.conn.in_transaction:
+            if savepoint is None:
+                self.conn.execute("COMMIT" if commit else "ROLLBACK")
+            else:
+                if not commit:
+                    self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+        if not commit:
+            # total_changes and data_version don't move on rollback, so statistics
+            # cached from inside the batch would otherwise keep being served
+            self._stats_cache = None
+            # Rows deferred for recurring detection during the batch are gone too
+            self._pending_recurring_files = pending_recurring_files
+    
     def close(self):
         """Close the database connection."""
         if self.conn:
+            try:
+                # Refresh planner statistics for tables whose contents changed
+                # meaningfully (e.g. after a bulk import); cheap when nothing did
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass  # Statistics are an optimization only
             self.conn.close()
+            self.conn = None
+    
+    def __enter__(self):
+        """Connect on entry so the exporter can be used in a with statement."""
+        if self.conn is None and not self.connect():
+            raise sqlite3.OperationalError(f"Unable to open database: {self.db_path}")
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the connection on exit, including when an exception escapes."""
+        self.close()
+        return False
     
     def create_schema(self):
         """Create the database schema for financial data."""
-        cursor = self.conn.cursor()
+        self.conn.executescript(SCHEMA_SQL)
         
-        # Transactions table - main table for all financial transactions
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_file TEXT NOT NULL,
-                transaction_date TEXT,
-                amount REAL,
-                description TEXT,
-                merchant_name TEXT,
-                category TEXT,
-                account_type TEXT,
-                bank_name TEXT,
-                transaction_type TEXT,
-                reference_number TEXT,
-                notes TEXT,
-                is_recurring INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Add merchant_name column if it doesn't exist (migration)
-        try:
-            cursor.execute("ALTER TABLE transactions ADD COLUMN merchant_name TEXT")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        # Add is_recurring column if it doesn't exist (migration)
-        try:
-            cursor.execute("ALTER TABLE transactions ADD COLUMN is_recurring INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        # Add tags column if it doesn't exist (migration)
-        try:
-            cursor.execute("ALTER TABLE transactions ADD COLUMN tags TEXT")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        # Files table - track which files have been imported
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS imported_files (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                file_path TEXT UNIQUE NOT NULL,
-                file_type TEXT,
-                import_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                row_count INTEGER,
-                notes TEXT
-            )
-        """)
+        # Migrate older databases before indexing the added columns
+        cursor = self.conn.cursor()
+        migrations = TRANSACTION_COLUMN_MIGRATIONS
+        if HAS_GENERATED_COLUMNS:
+            migrations += MONTH_KEY_MIGRATIONS
+        for migration in migrations:
+            try:
+                cursor.execute(migration)
+            except sqlite3.OperationalError as e:
+                if 'duplicate column' not in str(e):
+                    raise
+                # Otherwise the column already exists
+        
+        self.conn.executescript(MIGRATED_COLUMN_INDEXES_SQL)
+        
+        self._has_unique_index = self._unique_index_exists()
+        if not self._has_unique_index and not self._unique_index_failed:
+            try:
+                with self._transaction():
+                    cursor.execute(TRANSACTION_UNIQUE_INDEX_SQL)
+                self._has_unique_index = True
+            except sqlite3.IntegrityError:
+                # Existing duplicate rows; don't rescan the table on every call
+                self._unique_index_failed = True
+                print("Warning: existing duplicate transactions prevent building idx_tx_unique; "
+                      "exact duplicates are only caught by insert_transactions() duplicate checks")
+        
+        self._normalize_stored_transaction_dates()
+    
+    def _unique_index_exists(self) -> bool:
+        """Check whether the idx_tx_unique exact-duplicate index exists."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_tx_unique'")
+        return cursor.fetchone() is not None
+    
+    def _skips_exact_duplicates(self) -> bool:
+        """Whether inserts can use TRANSACTION_CONFLICT_CLAUSE.
         
-        # Metadata table - store sanitization metadata
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS metadata (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT UNIQUE NOT NULL,
-                value TEXT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        Without idx_tx_unique (a legacy database holding duplicates) ON CONFLICT
+        has no constraint to name, so inserts fall back to a plain INSERT.
+        """
+        if self._has_unique_index is None:
+            self._has_unique_index = self._unique_index_exists()
+        return self._has_unique_index
+    
+    def _insert_transaction_sql(self) -> str:
+        """Pick the transaction INSERT for the current database."""
+        return INSERT_TRANSACTION_SKIP_DUPLICATES_SQL if self._skips_exact_duplicates() else INSERT_TRANSACTION_SQL
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def normalize_transaction_date(value: str) -> str:
+        """Normalize a statement date to ISO YYYY-MM-DD.
         
-        # Paystubs table - store income/payroll data
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS paystubs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_file TEXT NOT NULL,
-                pay_date TEXT,
-                pay_period_start TEXT,
-                pay_period_end TEXT,
-                employer_name TEXT,
-                gross_pay REAL,
-                regular_hours REAL,
-                overtime_hours REAL,
-                regular_rate REAL,
-                overtime_rate REAL,
-                bonus REAL,
-                commission REAL,
-                deductions_json TEXT,
-                total_deductions REAL,
-                net_pay REAL,
-                ytd_gross REAL,
-                ytd_net REAL,
-                ytd_taxes REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        Args:
+            value: Date as found in the statement (e.g. '1/5/24', '01-05-2024', '2024-01-05')
+            
+        Returns:
+            ISO date string, or the original value if it is not a recognizable date
+        """
+        text = value.strip()
+        match = US_DATE_PATTERN.fullmatch(text)
+        if match:
+            month, day, year = (int(part) for part in match.groups())
+            if len(match.group(3)) == 2:
+                year += 2000 if year < 69 else 1900  # Same pivot as strptime's %y
+        else:
+            match = ISO_DATE_PATTERN.fullmatch(text)
+            if not match:
+                return value
+            year, month, day = (int(part) for part in match.groups())
         
-        # Create indexes for common queries
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_transaction_date ON transactions(transaction_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_amount ON transactions(amount)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON transactions(category)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_source_file ON transactions(source_file)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_merchant_name ON transactions(merchant_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_is_recurring ON transactions(is_recurring)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_account_type ON transactions(account_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_bank_name ON transactions(bank_name)")
-        
-        # Add bank_name column if it doesn't exist (migration)
         try:
-            cursor.execute("ALTER TABLE transactions ADD COLUMN bank_name TEXT")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_paystub_date ON paystubs(pay_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_paystub_source ON paystubs(source_file)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_paystub_employer ON paystubs(employer_name)")
-        
-        # Account balances table - track account balances over time
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS account_balances (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_file TEXT NOT NULL,
-                statement_date TEXT,
-                balance REAL NOT NULL,
-                available_credit REAL,
-                credit_limit REAL,
-                minimum_payment REAL,
-                payment_due_date TEXT,
-                apr REAL,
-                account_type TEXT,
-                bank_name TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_balance_date ON account_balances(statement_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_balance_source ON account_balances(source_file)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_balance_bank ON account_balances(bank_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_balance_type ON account_balances(account_type)")
-        
-        # Bills table - track recurring bills and payments
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS bills (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                merchant_name TEXT NOT NULL,
-                category TEXT,
-                amount REAL,
-                due_date TEXT,
-                frequency TEXT,
-                is_active INTEGER DEFAULT 1,
-                last_paid_date TEXT,
-                next_due_date TEXT,
-                payment_count INTEGER DEFAULT 0,
-                total_paid REAL DEFAULT 0,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_bill_merchant ON bills(merchant_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_bill_due_date ON bills(next_due_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_bill_active ON bills(is_active)")
-        
-        # Investment accounts table - track investment account information
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS investment_accounts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_file TEXT NOT NULL,
-                account_type TEXT NOT NULL,
-                bank_name TEXT,
-                account_name TEXT,
-                statement_date TEXT,
-                portfolio_value REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Holdings table - track securities positions
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS holdings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                investment_account_id INTEGER,
-                source_file TEXT NOT NULL,
-                statement_date TEXT,
-                ticker TEXT,
-                security_name TEXT,
-                quantity REAL,
-                market_value REAL,
-                cost_basis REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (investment_account_id) REFERENCES investment_accounts(id)
-            )
-        """)
-        
-        # Investment transactions table - track buys, sells, dividends, etc.
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS investment_transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                investment_account_id INTEGER,
-                source_file TEXT NOT NULL,
-                transaction_date TEXT,
-                transaction_type TEXT NOT NULL,
-                security_ticker TEXT,
-                security_name TEXT,
-                quantity REAL,
-                price REAL,
-                amount REAL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (investment_account_id) REFERENCES investment_accounts(id)
-            )
-        """)
-        
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_investment_account_type ON investment_accounts(account_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_investment_bank ON investment_accounts(bank_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_investment_date ON investment_accounts(statement_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_holding_ticker ON holdings(ticker)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_holding_date ON holdings(statement_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_inv_trans_type ON investment_transactions(transaction_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_inv_trans_date ON investment_transactions(transaction_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_inv_trans_ticker ON investment_transactions(security_ticker)")
-        
-        # Tax documents table - track tax forms (1099-INT, 1099-DIV, 1099-B, W-2)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tax_documents (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_file TEXT NOT NULL,
-                document_type TEXT NOT NULL,
-                tax_year INTEGER,
-                payer_name TEXT,
-                employer_name TEXT,
-                interest_income REAL,
-                ordinary_dividends REAL,
-                qualified_dividends REAL,
-                total_capital_gain REAL,
-                proceeds REAL,
-                cost_basis REAL,
-                gain_loss REAL,
-                wages REAL,
-                federal_tax_withheld REAL,
-                social_security_wages REAL,
-                social_security_tax REAL,
-                medicare_wages REAL,
-                medicare_tax REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tax_doc_type ON tax_documents(document_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tax_doc_year ON tax_documents(tax_year)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tax_doc_source ON tax_documents(source_file)")
-        
-        # Budgets table - track monthly budgets by category
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS budgets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category TEXT NOT NULL,
-                month TEXT NOT NULL,
-                year INTEGER NOT NULL,
-                budget_amount REAL NOT NULL,
-                is_active INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(category, month, year)
-            )
-        """)
+            return datetime(year, month, day).strftime('%Y-%m-%d')
+        except ValueError:
+            return value  # e.g. 13/45/2024
+    
+    def _normalize_stored_transaction_dates(self):
+        """Rewrite dates stored before normalization (e.g. MM/DD/YYYY) as ISO.
         
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_budget_category ON budgets(category)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_budget_month_year ON budgets(year, month)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_budget_active ON budgets(is_active)")
+        Runs once per database. A legacy row whose ISO twin already exists is
+        an exact duplicate once normalized, so it is deleted.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= DATES_NORMALIZED_USER_VERSION:
+            return
         
-        # Financial goals table - track financial goals and progress
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS financial_goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                goal_name TEXT NOT NULL,
-                goal_type TEXT NOT NULL,
-                target_amount REAL NOT NULL,
-                current_amount REAL DEFAULT 0,
-                target_date TEXT,
-                start_date TEXT,
-                description TEXT,
-                is_active INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            SELECT DISTINCT transaction_date FROM transactions
+            WHERE transaction_date IS NOT NULL
+            AND transaction_date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
         """)
-        
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_type ON financial_goals(goal_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_active ON financial_goals(is_active)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_target_date ON financial_goals(target_date)")
-        
-        self.conn.commit()
+        updates = []
+        for (stored,) in cursor.fetchall():
+            normalized = self.normalize_transaction_date(stored)
+            if normalized != stored:
+                updates.append((normalized, stored))
+        
+        with self._transaction():
+            if updates:
+                # OR IGNORE: a row that would collide with its already-normalized
+                # twin under idx_tx_unique keeps its old date, and is then dropped
+                cursor.executemany(
+                    "UPDATE OR IGNORE transactions SET transaction_date = ? WHERE transaction_date = ?",
+                    updates
+                )
+                cursor.executemany(
+                    "DELETE FROM transactions WHERE transaction_date = ?",
+                    [(stored,) for _, stored in updates]
+                )
+            cursor.execute(f"PRAGMA user_version = {DATES_NORMALIZED_USER_VERSION}")
     
     def _detect_bank_name(self, text: str, source_file: str) -> Optional[str]:
         """Detect bank/issuer name from statement text and filename.
@@ -356,76 +796,21 @@ class DatabaseExporter:
         text_lower = text.lower()
         filename_lower = source_file.lower()
         
-        # Known bank/issuer patterns (order matters - more specific first)
-        bank_patterns = {
-            'American Express': [
-                r'american\s+express',
-                r'amex',
-                r'\bamex\b',
-            ],
-            'Discover': [
-                r'discover\s+(?:card|bank|financial)',
-                r'\bdiscover\b',
-            ],
-            'Charles Schwab': [
-                r'charles\s+schwab',
-                r'schwab\s+(?:bank|investor)',
-                r'\bschwab\b',
-            ],
-            'Chase': [
-                r'chase\s+(?:bank|card|sapphire)',
-                r'\bchase\b',
-            ],
-            'Bank of America': [
-                r'bank\s+of\s+america',
-                r'\bbofa\b',
-                r'\bbankofamerica\b',
-            ],
-            'Wells Fargo': [
-                r'wells\s+fargo',
-            ],
-            'Citibank': [
-                r'citi\s+(?:bank|card)',
-                r'\bcitibank\b',
-            ],
-            'Capital One': [
-                r'capital\s+one',
-            ],
-            'US Bank': [
-                r'us\s+bank',
-                r'\busbank\b',
-            ],
-            'PNC': [
-                r'\bpnc\s+(?:bank|card)',
-            ],
-            'TD Bank': [
-                r'td\s+bank',
-            ],
-            'Ally Bank': [
-                r'ally\s+bank',
-            ],
-        }
-        
         # Check filename first (often most reliable)
-        for bank_name, patterns in bank_patterns.items():
+        for bank_name, patterns in BANK_NAME_PATTERNS.items():
             for pattern in patterns:
-                if re.search(pattern, filename_lower):
+                if pattern.search(filename_lower):
                     return bank_name
         
         # Check text content
-        for bank_name, patterns in bank_patterns.items():
+        for bank_name, patterns in BANK_NAME_PATTERNS.items():
             for pattern in patterns:
-                if re.search(pattern, text_lower):
+                if pattern.search(text_lower):
                     return bank_name
         
         # Try to extract from common statement headers
-        header_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:card|bank|statement|account)',
-            r'statement\s+from\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-        ]
-        
-        for pattern in header_patterns:
-            match = re.search(pattern, text)
+        for pattern in BANK_HEADER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 potential_bank = match.group(1).strip()
                 # Validate it's a known bank or looks like a bank name
@@ -463,48 +848,9 @@ class DatabaseExporter:
             return 'investment_account'
         
         # Check text content for account type indicators
-        account_patterns = {
-            'checking': [
-                r'checking\s+account',
-                r'checking\s+statement',
-                r'demand\s+deposit',
-            ],
-            'savings': [
-                r'savings\s+account',
-                r'savings\s+statement',
-            ],
-            'credit_card': [
-                r'credit\s+card',
-                r'card\s+statement',
-                r'cardmember\s+statement',
-                r'account\s+summary',
-                r'payment\s+due',
-                r'minimum\s+payment',
-                r'available\s+credit',
-                r'credit\s+limit',
-            ],
-            'roth_ira': [
-                r'roth\s+ira',
-                r'roth\s+individual\s+retirement',
-            ],
-            'traditional_ira': [
-                r'traditional\s+ira',
-                r'rollover\s+ira',
-                r'ira\s+account',
-                r'individual\s+retirement\s+account',
-            ],
-            'investment_account': [
-                r'investment\s+account',
-                r'brokerage\s+account',
-                r'securities\s+account',
-                r'trading\s+account',
-                r'portfolio\s+statement',
-            ],
-        }
-        
-        for account_type, patterns in account_patterns.items():
+        for account_type, patterns in ACCOUNT_TYPE_PATTERNS.items():
             for pattern in patterns:
-                if re.search(pattern, text_lower):
+                if pattern.search(text_lower):
                     return account_type
         
         # Default: try to infer from transaction patterns
@@ -526,55 +872,85 @@ class DatabaseExporter:
         Returns:
             List of transaction dictionaries
         """
-        transactions = []
-        lines = text.split('\n')
+        return list(self.iter_transactions_from_text(text, source_file))
+    
+    def iter_transactions_from_text(self, text: str, source_file: str) -> Iterator[Dict[str, Any]]:
+        """Yield transaction-like data from sanitized text one transaction at a time.
         
+        Args:
+            text: Sanitized text content
+            source_file: Source file name
+            
+        Yields:
+            Transaction dictionaries
+        """
         # Detect account type and bank name
         account_type = self._detect_account_type(text, source_file)
         bank_name = self._detect_bank_name(text, source_file)
         
-        # Look for date patterns and amounts
-        date_pattern = r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'
-        amount_pattern = r'[\$]?([\d,]+\.?\d*)'
-        
+        # First pass: regex scan collecting raw amount tokens with their line context
         current_date = None
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('[') or 'REDACTED' in line:
+        token_contexts = []  # (transaction_date, description) for each amount token
+        amount_strs = []
+        for line_match in LINE_PATTERN.finditer(text):
+            line = line_match.group().strip()
+            if not line or line[0] == '[':
                 continue
             
-            # Try to find dates
-            date_match = re.search(date_pattern, line)
-            if date_match:
-                current_date = date_match.group()
-            
-            # Try to find amounts
-            amount_matches = re.findall(amount_pattern, line)
-            for amount_str in amount_matches:
-                try:
-                    amount = float(amount_str.replace(',', ''))
-                    # Only consider significant amounts (likely transactions)
-                    if abs(amount) > 0.01:
-                        description = line[:200]  # First 200 chars
-                        transaction = {
-                            'source_file': source_file,
-                            'transaction_date': current_date or None,
-                            'amount': amount,
-                            'description': description,
-                            'merchant_name': self.merchant_extractor.extract(description),
-                            'category': self.categorizer.categorize(description),
-                            'account_type': account_type,
-                            'bank_name': bank_name,
-                            'transaction_type': 'debit' if amount < 0 else 'credit',
-                            'reference_number': None,
-                            'notes': None,
-                            'is_recurring': 0
-                        }
-                        transactions.append(transaction)
-                except ValueError:
-                    continue
-        
-        return transactions
+            # Cheapest tests first: lines without a digit cannot hold a date or
+            # amount, and lines without either are skipped before paying for
+            # the full-line REDACTED scan
+            if not DIGIT_PATTERN.search(line):
+                continue
+            
+            matches = list(TRANSACTION_TOKEN_PATTERN.finditer(line))
+            if not matches or 'REDACTED' in line:
+                continue
+            
+            # Single pass over the line collecting the date and any amounts
+            line_amounts = []
+            for match in matches:
+                if match.lastgroup == 'date':
+                    current_date = self.normalize_transaction_date(match.group('date'))
+                else:
+                    line_amounts.append(match.group('amount'))
+            
+            description = line[:200]  # First 200 chars
+            for amount_str in line_amounts:
+                amount_strs.append(amount_str.replace(',', ''))
+                token_contexts.append((current_date or None, description))
+        
+        if not amount_strs:
+            return
+        
+        # Second pass: numeric conversion over the whole array
+        amounts = np.array(amount_strs).astype(np.float64)
+        # Only consider significant amounts (likely transactions)
+        significant = np.flatnonzero(np.abs(amounts) > 0.01)
+        
+        # Merchant extraction and categorization run over all descriptions at once
+        contexts = [token_contexts[idx] for idx in significant.tolist()]
+        descriptions = [description for _, description in contexts]
+        merchants = self.merchant_extractor.extract_batch(descriptions)
+        categories = self.categorizer.categorize_batch(descriptions)
+        
+        # transaction_type is derived from the amount on insert
+        for (transaction_date, description), amount, merchant_name, category in zip(
+            contexts, amounts[significant].tolist(), merchants, categories
+        ):
+            yield {
+                'source_file': source_file,
+                'transaction_date': transaction_date,
+                'amount': amount,
+                'description': description,
+                'merchant_name': merchant_name,
+                'category': category,
+                'account_type': account_type,
+                'bank_name': bank_name,
+                'reference_number': None,
+                'notes': None,
+                'is_recurring': 0
+            }
     
     def extract_transactions_from_csv(self, rows: List[Dict], source_file: str) -> List[Dict[str, Any]]:
         """Extract transactions from CSV data.
@@ -586,60 +962,81 @@ class DatabaseExporter:
         Returns:
             List of transaction dictionaries
         """
-        transactions = []
-        
-        # Common column name mappings
-        date_columns = ['date', 'transaction_date', 'post_date', 'posted_date']
-        amount_columns = ['amount', 'transaction_amount', 'debit', 'credit', 'balance']
-        desc_columns = ['description', 'memo', 'details', 'transaction_description']
+        return list(self.iter_transactions_from_csv(rows, source_file))
+    
+    def iter_transactions_from_csv(self, rows: List[Dict], source_file: str) -> Iterator[Dict[str, Any]]:
+        """Yield transactions from CSV data one row at a time.
         
-        for row in rows:
-            # Detect bank name from filename (for CSV/Excel files)
-            bank_name = self._detect_bank_name("", source_file)  # Pass empty text, use filename only
+        Args:
+            rows: List of CSV row dictionaries
+            source_file: Source file name
             
+        Yields:
+            Transaction dictionaries
+        """
+        if not rows:
+            return
+        
+        # Detect bank name from filename (for CSV/Excel files)
+        bank_name = self._detect_bank_name("", source_file)  # Pass empty text, use filename only
+        
+        # Resolve the header once (case-insensitive); rows fall back through the
+        # matching columns in order of preference
+        header = rows[0].keys()
+        date_cols = self._resolve_columns(header, DATE_COLUMNS)
+        amount_cols = self._resolve_columns(header, AMOUNT_COLUMNS)
+        desc_cols = self._resolve_columns(header, DESCRIPTION_COLUMNS)
+        account_cols = self._resolve_columns(header, ACCOUNT_TYPE_COLUMNS)
+        
+        # Resolve descriptions up front so merchant extraction and categorization
+        # run over the whole file at once
+        descriptions = [
+            next((str(row[col])[:500] for col in desc_cols if row.get(col)), None)  # Limit length
+            for row in rows
+        ]
+        merchants = self.merchant_extractor.extract_batch(descriptions)
+        categories = self.categorizer.categorize_batch(descriptions)
+        
+        for row, description, merchant_name, category in zip(rows, descriptions, merchants, categories):
             transaction = {
                 'source_file': source_file,
                 'transaction_date': None,
                 'amount': None,
-                'description': None,
-                'merchant_name': None,
-                'category': None,
+                'description': description,
+                'merchant_name': merchant_name,
+                'category': category,
                 'account_type': None,
                 'bank_name': bank_name,
-                'transaction_type': None,
                 'reference_number': None,
                 'notes': None,
                 'is_recurring': 0
             }
             
             # Find date column
-            for col in date_columns:
-                if col in row and row[col]:
-                    transaction['transaction_date'] = str(row[col])
+            for col in date_cols:
+                value = row.get(col)
+                if value:
+                    transaction['transaction_date'] = self.normalize_transaction_date(str(value))
                     break
             
             # Find amount column
-            for col in amount_columns:
-                if col in row and row[col]:
-                    try:
-                        amount_str = str(row[col]).replace('$', '').replace(',', '').strip()
-                        transaction['amount'] = float(amount_str)
-                        transaction['transaction_type'] = 'debit' if transaction['amount'] < 0 else 'credit'
-                    except (ValueError, AttributeError):
-                        pass
-                    break
-            
-            # Find description column
-            for col in desc_columns:
-                if col in row and row[col]:
-                    transaction['description'] = str(row[col])[:500]  # Limit length
+            for col in amount_cols:
+                value = row.get(col)
+                if value:
+                    amount_str = str(value).translate(AMOUNT_STRIP_TABLE)
+                    # Only attempt conversion on values that can start a number
+                    if amount_str and (amount_str[0].isdigit() or amount_str[0] in '-+.'):
+                        try:
+                            transaction['amount'] = float(amount_str)
+                        except ValueError:
+                            pass
                     break
             
             # Try to detect account type from CSV data
-            account_type_columns = ['account_type', 'account', 'account_name', 'account_description']
-            for col in account_type_columns:
-                if col in row and row[col]:
-                    account_str = str(row[col]).lower()
+            for col in account_cols:
+                value = row.get(col)
+                if value:
+                    account_str = str(value).lower()
                     if 'checking' in account_str or 'check' in account_str:
                         transaction['account_type'] = 'checking'
                     elif 'savings' in account_str or 'save' in account_str:
@@ -650,17 +1047,14 @@ class DatabaseExporter:
             
             # Only add if we have at least a date or amount
             if transaction['transaction_date'] or transaction['amount']:
-                # Extract merchant name and categorize
-                if transaction['description']:
-                    transaction['merchant_name'] = self.merchant_extractor.extract(transaction['description'])
-                    transaction['category'] = self.categorizer.categorize(transaction['description'])
-                transactions.append(transaction)
-        
-        return transactions
+                yield transaction
     
     def extract_transactions_from_dataframe(self, df, source_file: str) -> List[Dict[str, Any]]:
         """Extract transactions from pandas DataFrame.
         
+        Columns are parsed with vectorized pandas operations rather than
+        converting every row to a dictionary first.
+        
         Args:
             df: pandas DataFrame
             source_file: Source file name
@@ -668,65 +1062,250 @@ class DatabaseExporter:
         Returns:
             List of transaction dictionaries
         """
-        transactions = []
+        transactions_df = self.build_transactions_dataframe(df, source_file)
+        return transactions_df.astype(object).where(transactions_df.notna(), None).to_dict('records')
+    
+    def build_transactions_dataframe(self, df, source_file: str) -> pd.DataFrame:
+        """Build a DataFrame of transactions from a statement DataFrame.
         
-        # Convert DataFrame to list of dicts and use CSV extraction logic
-        rows = df.to_dict('records')
-        return self.extract_transactions_from_csv(rows, source_file)
+        Args:
+            df: pandas DataFrame as read from a CSV/Excel statement
+            source_file: Source file name
+            
+        Returns:
+            DataFrame with one row per transaction and TRANSACTION_FIELDS columns
+        """
+        if df is None or df.empty:
+            return pd.DataFrame(columns=TRANSACTION_FIELDS)
+        
+        # Detect bank name from filename (for CSV/Excel files)
+        bank_name = self._detect_bank_name("", source_file)  # Pass empty text, use filename only
+        
+        dates = self._first_non_empty_column(
+            df, self._resolve_columns(df.columns, DATE_COLUMNS)
+        ).map(self.normalize_transaction_date, na_action='ignore')
+        descriptions = self._first_non_empty_column(
+            df, self._resolve_columns(df.columns, DESCRIPTION_COLUMNS)
+        ).str.slice(0, 500)  # Limit length
+        accounts = self._first_non_empty_column(
+            df, self._resolve_columns(df.columns, ACCOUNT_TYPE_COLUMNS)
+        ).str.lower()
+        amounts = self._first_non_empty_amount(df, self._resolve_columns(df.columns, AMOUNT_COLUMNS))
+        
+        account_types = np.select(
+            [
+                accounts.str.contains('checking|check', na=False),
+                accounts.str.contains('savings|save', na=False),
+                accounts.str.contains('credit|card', na=False),
+            ],
+            ['checking', 'savings', 'credit_card'],
+            default=None
+        )
+        
+        # Only keep rows with at least a date or amount
+        keep = (dates.notna() | (amounts.notna() & (amounts != 0))).to_numpy()
+        descriptions = descriptions[keep]
+        
+        # Merchant extraction and categorization run once per distinct description
+        unique_descriptions = descriptions.dropna().unique()
+        merchants = dict(zip(unique_descriptions, self.merchant_extractor.extract_batch(unique_descriptions)))
+        categories = dict(zip(unique_descriptions, self.categorizer.categorize_batch(unique_descriptions)))
+        
+        return pd.DataFrame({
+            'source_file': source_file,
+            'transaction_date': dates[keep],
+            'amount': amounts[keep],
+            'description': descriptions,
+            'merchant_name': descriptions.map(merchants),
+            'category': descriptions.map(categories),
+            'account_type': account_types[keep],
+            'bank_name': bank_name,
+            'reference_number': None,
+            'notes': None,
+            'is_recurring': 0,
+        }, columns=TRANSACTION_FIELDS).reset_index(drop=True)
     
-    def _is_duplicate_transaction(self, transaction: Dict[str, Any], cursor: sqlite3.Cursor) -> bool:
-        """Check if a transaction already exists in the database.
+    @staticmethod
+    def _resolve_columns(keys, candidates: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """Map candidate column names onto the actual header keys, ignoring case.
+        
+        Args:
+            keys: Header keys (CSV row keys or DataFrame columns)
+            candidates: Lowercase column names in order of preference
+            
+        Returns:
+            Tuple of matching header keys in order of preference
+        """
+        keys_by_name = {}
+        for key in keys:
+            if isinstance(key, str):
+                keys_by_name.setdefault(key.strip().lower(), []).append(key)
+        return tuple(key for candidate in candidates for key in keys_by_name.get(candidate, ()))
+    
+    @staticmethod
+    def _first_non_empty_column(df, columns: Tuple[Any, ...]) -> pd.Series:
+        """Coalesce columns into one string Series, first non-empty value wins.
+        
+        Args:
+            df: pandas DataFrame
+            columns: Existing column names in order of preference
+            
+        Returns:
+            Series of strings, with None where no column has a value
+        """
+        result = pd.Series(None, index=df.index, dtype=object)
+        for col in columns:
+            values = df[col]
+            text = values.astype(str)
+            present = values.notna() & (text.str.strip() != '')
+            result = result.where(result.notna() | ~present, text)
+        return result
+    
+    @staticmethod
+    def _first_non_empty_amount(df, columns: Tuple[Any, ...]) -> pd.Series:
+        """Coalesce amount columns into one float Series, first non-empty value wins.
+        
+        Numeric columns (typical for Excel) are used as-is; text columns have
+        '$' and ',' stripped before parsing. Unparseable values become NaN.
+        
+        Args:
+            df: pandas DataFrame
+            columns: Existing column names in order of preference
+            
+        Returns:
+            Series of floats, NaN where no column has a usable value
+        """
+        amounts = pd.Series(np.nan, index=df.index, dtype=np.float64)
+        taken = pd.Series(False, index=df.index)
+        for col in columns:
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                present = values.notna()
+                parsed = values.astype(np.float64)
+            else:
+                text = values.astype(str)
+                present = values.notna() & (text.str.strip() != '')
+                parsed = pd.to_numeric(text.str.replace(r'[$,]', '', regex=True).str.strip(), errors='coerce')
+            fill = present & ~taken
+            amounts = amounts.where(~fill, parsed)
+            taken |= fill
+        return amounts
+    
+    def _find_duplicate_transactions(self, transactions: List[Dict[str, Any]],
+                                     cursor: sqlite3.Cursor) -> set:
+        """Find which transactions already exist in the database.
         
         A transaction is considered a duplicate if it has:
         - Same date
         - Same amount (within 0.01 tolerance for floating point)
         - Same merchant name (if available) OR similar description
         
+        The candidates are loaded into a temp table and matched with one
+        EXISTS query, instead of one lookup per transaction.
+        
         Args:
-            transaction: Transaction dictionary to check
+            transactions: Transaction dictionaries to check
             cursor: Database cursor
             
         Returns:
-            bool: True if duplicate found, False otherwise
+            Set of indexes into transactions that have a duplicate
         """
-        date = transaction.get('transaction_date')
-        amount = transaction.get('amount')
-        merchant = transaction.get('merchant_name')
-        description = transaction.get('description')
+        candidates = []
+        for index, transaction in enumerate(transactions):
+            date = transaction.get('transaction_date')
+            amount = transaction.get('amount')
+            if not date or amount is None:
+                continue  # Can't match without date/amount
+            
+            # If we have a merchant name, use it for matching (more reliable);
+            # otherwise match on description (first 50 chars for fuzzy matching)
+            merchant = transaction.get('merchant_name')
+            description = transaction.get('description')
+            if merchant:
+                candidates.append((index, date, amount, merchant, None))
+            elif description:
+                candidates.append((index, date, amount, None, f"{description[:50]}%"))
+            # No merchant or description - can't reliably detect duplicate
         
-        if not date or amount is None:
-            return False  # Can't match without date/amount
+        if not candidates:
+            return set()
         
-        # Build query to find potential duplicates
-        query = """
-            SELECT COUNT(*) FROM transactions
-            WHERE transaction_date = ? 
-            AND ABS(amount - ?) < 0.01
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS incoming_transactions (
+                idx INTEGER PRIMARY KEY,
+                transaction_date TEXT,
+                amount REAL,
+                merchant_name TEXT,
+                description_pattern TEXT
+            )
+        """)
+        cursor.execute("DELETE FROM temp.incoming_transactions")
+        cursor.executemany("INSERT INTO temp.incoming_transactions VALUES (?, ?, ?, ?, ?)", candidates)
+        # One branch per matching rule, so the merchant branch can seek
+        # idx_tx_dup on (date, merchant) instead of filtering every row of the date.
+        # The BETWEEN bounds turn the amount tolerance into an index range; ABS
+        # keeps the exact strict comparison at the edges.
+        cursor.execute("""
+            SELECT i.idx FROM temp.incoming_transactions i
+            WHERE i.merchant_name IS NOT NULL AND EXISTS (
+                SELECT 1 FROM transactions t
+                WHERE t.transaction_date = i.transaction_date
+                AND t.merchant_name = i.merchant_name
+                AND t.amount BETWEEN i.amount - 0.01 AND i.amount + 0.01
+                AND ABS(t.amount - i.amount) < 0.01
+            )
+            UNION ALL
+            SELECT i.idx FROM temp.incoming_transactions i
+            WHERE i.merchant_name IS NULL AND EXISTS (
+                SELECT 1 FROM transactions t
+                WHERE t.transaction_date = i.transaction_date
+                AND t.amount BETWEEN i.amount - 0.01 AND i.amount + 0.01
+                AND ABS(t.amount - i.amount) < 0.01
+                AND t.description LIKE i.description_pattern
+            )
+        """)
+        return {row[0] for row in cursor}
+    
+    def _batch_duplicate_key(self, transaction: Dict[str, Any]) -> Optional[Tuple]:
+        """Build an in-memory key mirroring the duplicate rules of _find_duplicate_transactions.
+        
+        Used to catch duplicates within a single batch, which are not yet visible
+        to the database lookup.
+        
+        Args:
+            transaction: Transaction dictionary
+            
+        Returns:
+            Hashable key, or None if the transaction can't be matched reliably
         """
-        params = [date, amount]
+        date = transaction.get('transaction_date')
+        amount = transaction.get('amount')
+        if not date or amount is None:
+            return None
         
-        # If we have a merchant name, use it for matching (more reliable)
+        merchant = transaction.get('merchant_name')
         if merchant:
-            query += " AND merchant_name = ?"
-            params.append(merchant)
-        # Otherwise, try to match on description (first 50 chars for fuzzy matching)
-        elif description:
-            query += " AND description LIKE ?"
-            params.append(f"{description[:50]}%")
-        else:
-            # No merchant or description - can't reliably detect duplicate
-            return False
-        
-        cursor.execute(query, params)
-        count = cursor.fetchone()[0]
-        return count > 0
+            return (date, round(amount, 2), 'merchant', merchant)
+        description = transaction.get('description')
+        if description:
+            return (date, round(amount, 2), 'description', description[:50].lower())
+        return None
     
-    def insert_transactions(self, transactions: List[Dict[str, Any]], skip_duplicates: bool = True) -> Dict[str, int]:
+    def insert_transactions(self, transactions: Iterable[Any], skip_duplicates: bool = True,
+                            defer_recurring: bool = False) -> Dict[str, int]:
         """Insert transactions into the database.
         
         Args:
-            transactions: List of transaction dictionaries
-            skip_duplicates: If True, skip duplicate transactions (default: True)
+            transactions: List or iterator of transaction dictionaries (e.g. from
+                iter_transactions_from_text) or Transaction records; consumed in
+                chunks as it is read
+            skip_duplicates: If True, skip duplicate transactions (default: True).
+                Exact duplicates (same source file, date, amount and description)
+                are skipped either way once the idx_tx_unique index exists, as
+                the index cannot hold them; False only turns off the
+                near-duplicate checks
+            defer_recurring: If True, leave recurring detection to a later
+                finalize_recurring() call (e.g. once after importing many files)
             
         Returns:
             Dictionary with 'inserted' and 'skipped' counts
@@ -735,55 +1314,167 @@ class DatabaseExporter:
             return {'inserted': 0, 'skipped': 0}
         
         cursor = self.conn.cursor()
+        insert_sql = self._insert_transaction_sql()
         inserted_count = 0
         skipped_count = 0
+        source_files = set()
         
         try:
-            for transaction in transactions:
-                # Check for duplicates if enabled
-                if skip_duplicates and self._is_duplicate_transaction(transaction, cursor):
-                    skipped_count += 1
-                    continue
-                
-                cursor.execute("""
-                    INSERT INTO transactions 
-                    (source_file, transaction_date, amount, description, merchant_name, category, 
-                     account_type, bank_name, transaction_type, reference_number, notes, is_recurring)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    transaction.get('source_file'),
-                    transaction.get('transaction_date'),
-                    transaction.get('amount'),
-                    transaction.get('description'),
-                    transaction.get('merchant_name'),
-                    transaction.get('category'),
-                    transaction.get('account_type'),
-                    transaction.get('bank_name'),
-                    transaction.get('transaction_type'),
-                    transaction.get('reference_number'),
-                    transaction.get('notes'),
-                    transaction.get('is_recurring', 0)
-                ))
-                inserted_count += 1
-            
-            self.conn.commit()
+            # The duplicate checks and the inserts share one explicit transaction,
+            # so the whole batch costs a single commit and sees one snapshot
+            with self._transaction():
+                # Build parameter tuples, filtering duplicates against both the
+                # database and earlier rows of this same batch. Input is read in
+                # chunks so memory stays bounded however long it is.
+                transactions = iter(transactions)
+                seen_keys = set()
+                for chunk in iter(lambda: list(itertools.islice(transactions, INSERT_BATCH_SIZE)), []):
+                    if skip_duplicates:
+                        candidates = [
+                            transaction._asdict() if isinstance(transaction, Transaction) else transaction
+                            for transaction in chunk
+                        ]
+                        duplicates = self._find_duplicate_transactions(candidates, cursor)
+                    
+                    rows = []
+                    for index, transaction in enumerate(chunk):
+                        if skip_duplicates:
+                            key = self._batch_duplicate_key(candidates[index])
+                            if key is not None and key in seen_keys:
+                                skipped_count += 1
+                                continue
+                            if index in duplicates:
+                                skipped_count += 1
+                                continue
+                            if key is not None:
+                                seen_keys.add(key)
+                        
+                        if isinstance(transaction, Transaction):
+                            rows.append(transaction)  # Already the parameter tuple
+                        else:
+                            try:
+                                rows.append(TRANSACTION_ROW(transaction))
+                            except KeyError:
+                                # Partial dict from an outside caller; fill in the defaults
+                                rows.append(TRANSACTION_ROW({**TRANSACTION_DEFAULTS, **transaction}))
+                    
+                    # Descriptions from outside callers are capped at 500 characters by SQLite itself
+                    if rows:
+                        source_files.update(map(operator.itemgetter(0), rows))
+                        cursor.executemany(insert_sql, rows)
+                        # Rows ignored by the unique index count as skipped
+                        inserted_count += cursor.rowcount
+                        skipped_count += len(rows) - cursor.rowcount
             
             # After inserting, detect and mark recurring transactions
             if inserted_count > 0:
-                try:
-                    self._detect_recurring_transactions()
-                    # Update bills table from recurring transactions
-                    self.update_bills_from_recurring_transactions()
-                except Exception as e:
-                    # Log but don't fail - recurring detection is not critical
-                    print(f"Warning: Failed to detect recurring transactions: {e}")
+                self._update_recurring(source_files, defer=defer_recurring)
             
             return {'inserted': inserted_count, 'skipped': skipped_count}
         except Exception as e:
-            self.conn.rollback()
             print(f"Error inserting transactions: {e}")
             return {'inserted': 0, 'skipped': skipped_count}
     
+    def insert_transaction_rows(self, rows: Iterable[Tuple], defer_recurring: bool = False) -> Dict[str, int]:
+        """Bulk-insert transaction tuples already in TRANSACTION_FIELDS order.
+        
+        Rows go straight to executemany with no per-row dict handling. Only
+        exact duplicates (rejected by the idx_tx_unique index) are skipped, as
+        with insert_transactions_df(); use insert_transactions() when
+        near-duplicates must be skipped as well.
+        
+        Args:
+            rows: Iterable of tuples or Transaction records, one value per
+                TRANSACTION_FIELDS entry
+            defer_recurring: If True, leave recurring detection to a later
+                finalize_recurring() call
+            
+        Returns:
+            Dictionary with 'inserted' and 'skipped' counts
+        """
+        cursor = self.conn.cursor()
+        insert_sql = self._insert_transaction_sql()
+        rows = iter(rows)
+        inserted_count = 0
+        skipped_count = 0
+        source_files = set()
+        
+        try:
+            with self._transaction():
+                # Chunked so memory stays bounded however long the input is
+                for chunk in iter(lambda: list(itertools.islice(rows, INSERT_BATCH_SIZE)), []):
+                    source_files.update(map(operator.itemgetter(0), chunk))
+                    cursor.executemany(insert_sql, chunk)
+                    inserted_count += cursor.rowcount
+                    skipped_count += len(chunk) - cursor.rowcount
+            
+            # After inserting, detect and mark recurring transactions
+            if inserted_count > 0:
+                self._update_recurring(source_files, defer=defer_recurring)
+            
+            return {'inserted': inserted_count, 'skipped': skipped_count}
+        except Exception as e:
+            print(f"Error inserting transactions: {e}")
+            return {'inserted': 0, 'skipped': 0}
+    
+    def insert_transactions_df(self, transactions_df: pd.DataFrame, defer_recurring: bool = False) -> Dict[str, int]:
+        """Bulk-insert a prepared transactions DataFrame with multi-row INSERTs.
+        
+        Only exact duplicates (rejected by the idx_tx_unique index) are skipped,
+        so this suits fresh or force re-imported files; use insert_transactions()
+        when near-duplicates must be skipped as well.
+        
+        Args:
+            transactions_df: DataFrame with TRANSACTION_FIELDS columns, e.g. from
+                build_transactions_dataframe()
+            defer_recurring: If True, leave recurring detection to a later
+                finalize_recurring() call
+            
+        Returns:
+            Dictionary with 'inserted' and 'skipped' counts
+        """
+        if transactions_df is None or transactions_df.empty:
+            return {'inserted': 0, 'skipped': 0}
+        
+        # Same derived values the INSERT statement applies on the dict path
+        out = transactions_df.reindex(columns=TRANSACTION_FIELDS)
+        amounts = pd.to_numeric(out['amount'], errors='coerce')
+        out['description'] = out['description'].str.slice(0, 500)
+        out['transaction_type'] = np.where(amounts < 0, 'debit', np.where(amounts.notna(), 'credit', None))
+        out['is_recurring'] = out['is_recurring'].fillna(0)
+        
+        columns = list(out.columns)
+        rows = out.astype(object).where(out.notna(), None).itertuples(index=False, name=None)
+        # Multi-row INSERT ... VALUES, sized to stay under the bound-parameter limit
+        chunk_size = MAX_SQL_VARIABLES // len(columns)
+        row_placeholders = '(' + ', '.join('?' * len(columns)) + ')'
+        conflict_clause = TRANSACTION_CONFLICT_CLAUSE if self._skips_exact_duplicates() else ''
+        cursor = self.conn.cursor()
+        inserted_count = 0
+        
+        try:
+            # Written on our own cursor rather than through DataFrame.to_sql, which
+            # commits the connection itself; inside begin_batch() this is a savepoint,
+            # so end_batch(commit=False) still discards these rows
+            with self._transaction():
+                for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+                    cursor.execute(
+                        f"INSERT INTO transactions ({', '.join(columns)}) "
+                        f"VALUES {', '.join([row_placeholders] * len(chunk))}{conflict_clause}",
+                        [value for row in chunk for value in row]
+                    )
+                    inserted_count += cursor.rowcount
+            skipped_count = len(out) - inserted_count
+            
+            # After inserting, detect and mark recurring transactions
+            if inserted_count > 0:
+                self._update_recurring(set(out['source_file'].dropna()), defer=defer_recurring)
+            
+            return {'inserted': inserted_count, 'skipped': skipped_count}
+        except Exception as e:
+            print(f"Error inserting transactions: {e}")
+            return {'inserted': 0, 'skipped': 0}
+    
     def is_file_imported(self, file_path: str) -> bool:
         """Check if a file has already been imported.
         
@@ -794,9 +1485,9 @@ class DatabaseExporter:
             bool: True if file has been imported, False otherwise
         """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM imported_files WHERE file_path = ?", (file_path,))
-        count = cursor.fetchone()[0]
-        return count > 0
+        # file_path is UNIQUE, so this is a single seek on its autoindex
+        cursor.execute("SELECT 1 FROM imported_files WHERE file_path = ? LIMIT 1", (file_path,))
+        return cursor.fetchone() is not None
     
     def record_file_import(self, file_path: str, file_type: str, row_count: int, notes: str = None):
         """Record that a file has been imported.
@@ -807,12 +1498,19 @@ class DatabaseExporter:
             row_count: Number of transactions imported
             notes: Optional notes about the import
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO imported_files (file_path, file_type, row_count, notes, import_date)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (file_path, file_type, row_count, notes))
-        self.conn.commit()
+        self.record_file_imports([(file_path, file_type, row_count, notes)])
+    
+    def record_file_imports(self, entries: List[Tuple[str, str, int, Optional[str]]]):
+        """Record several imported files in a single transaction.
+        
+        Args:
+            entries: List of (file_path, file_type, row_count, notes) tuples
+        """
+        with self._transaction():
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO imported_files (file_path, file_type, row_count, notes, import_date)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, entries)
     
     def delete_file_transactions(self, file_path: str) -> int:
         """Delete all transactions from a specific file (for re-import).
@@ -823,57 +1521,89 @@ class DatabaseExporter:
         Returns:
             int: Number of transactions deleted
         """
+        return self.delete_files_transactions([file_path])
+    
+    def delete_files_transactions(self, file_paths: List[str]) -> int:
+        """Delete all transactions from several files in a single transaction.
+        
+        Args:
+            file_paths: Paths to the files whose transactions should be deleted
+            
+        Returns:
+            int: Total number of transactions deleted
+        """
+        source_files = list(dict.fromkeys(os.path.basename(file_path) for file_path in file_paths))
         cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM transactions WHERE source_file = ?", (os.path.basename(file_path),))
-        deleted_count = cursor.rowcount
-        self.conn.commit()
+        deleted_count = 0
+        with self._transaction():
+            # One IN (...) statement per chunk, kept under SQLite's bound-parameter limit
+            for start in range(0, len(source_files), MAX_SQL_VARIABLES):
+                chunk = source_files[start:start + MAX_SQL_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f"DELETE FROM transactions WHERE source_file IN ({placeholders})",
+                    chunk
+                )
+                deleted_count += cursor.rowcount
         return deleted_count
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics.
         
+        Results are cached until this connection next modifies any row, so
+        repeated calls (e.g. the report exports) skip the aggregate queries.
+        
         Returns:
             Dictionary with statistics
         """
-        cursor = self.conn.cursor()
-        
-        stats = {}
-        
-        # Total transactions
-        cursor.execute("SELECT COUNT(*) FROM transactions")
-        stats['total_transactions'] = cursor.fetchone()[0]
-        
-        # Date range
-        cursor.execute("SELECT MIN(transaction_date), MAX(transaction_date) FROM transactions WHERE transaction_date IS NOT NULL")
-        date_range = cursor.fetchone()
-        stats['date_range'] = {'min': date_range[0], 'max': date_range[1]}
-        
-        # Total amount
-        cursor.execute("SELECT SUM(amount) FROM transactions WHERE amount IS NOT NULL")
-        total = cursor.fetchone()[0]
-        stats['total_amount'] = total if total else 0
-        
-        # Files imported
-        cursor.execute("SELECT COUNT(*) FROM imported_files")
-        stats['files_imported'] = cursor.fetchone()[0]
-        
-        # Paystub statistics
-        paystub_stats = self.get_paystub_statistics()
-        stats['paystubs'] = paystub_stats
-        
-        # Account type statistics
-        account_stats = self.get_account_statistics()
-        stats['accounts'] = account_stats
-        
-        # Bank/issuer statistics
-        bank_stats = self.get_bank_statistics()
-        stats['banks'] = bank_stats
-        
-        # Investment account statistics
-        investment_stats = self.get_investment_statistics()
-        stats['investments'] = investment_stats
-        
-        return stats
+        # Every query below reads the same snapshot
+        with self._read_transaction():
+            # total_changes counts this connection's writes; data_version moves when
+            # any other connection (another process or exporter) commits
+            changes = (self.conn.total_changes, self.conn.execute("PRAGMA data_version").fetchone()[0])
+            if self._stats_cache is not None and self._stats_cache[0] == changes:
+                return copy.deepcopy(self._stats_cache[1])
+            
+            cursor = self.conn.cursor()
+            
+            stats = {}
+            
+            # Transaction totals, date range and import count in one round-trip.
+            # Separate scalar subqueries let each aggregate use its own covering
+            # index (MIN/MAX become index endpoint probes), which beats a single
+            # combined aggregate that has to scan every row.
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM transactions),
+                    (SELECT MIN(transaction_date) FROM transactions WHERE transaction_date IS NOT NULL),
+                    (SELECT MAX(transaction_date) FROM transactions WHERE transaction_date IS NOT NULL),
+                    (SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE amount IS NOT NULL),
+                    (SELECT COUNT(*) FROM imported_files)
+            """)
+            row = cursor.fetchone()
+            stats['total_transactions'] = row[0]
+            stats['date_range'] = {'min': row[1], 'max': row[2]}
+            stats['total_amount'] = row[3]
+            stats['files_imported'] = row[4]
+            
+            # Paystub statistics
+            paystub_stats = self.get_paystub_statistics()
+            stats['paystubs'] = paystub_stats
+            
+            # Account type statistics
+            account_stats = self.get_account_statistics()
+            stats['accounts'] = account_stats
+            
+            # Bank/issuer statistics
+            bank_stats = self.get_bank_statistics()
+            stats['banks'] = bank_stats
+            
+            # Investment account statistics
+            investment_stats = self.get_investment_statistics()
+            stats['investments'] = investment_stats
+        
+        self._stats_cache = (changes, stats)
+        return copy.deepcopy(stats)
     
     def export_to_csv(self, output_path: str, date_range: Optional[Tuple[str, str]] = None, 
                      include_metadata: bool = True) -> bool:
@@ -885,7 +1615,8 @@ class DatabaseExporter:
             include_metadata: Whether to include metadata header explaining the data
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful, False otherwise. sqlite3.OperationalError
+            (e.g. a locked database) is raised rather than reported.
         """
         try:
             cursor = self.conn.cursor()
@@ -916,21 +1647,26 @@ class DatabaseExporter:
             
             query += " ORDER BY transaction_date, id"
             
+            # Rows are streamed straight from the cursor to the CSV writer as
+            # plain tuples; only positional access is used, and skipping
+            # sqlite3.Row construction is measurably cheaper on large exports
+            cursor.row_factory = None
             cursor.execute(query, params)
             
-            rows = cursor.fetchall()
-            
             import csv
             with open(output_path, 'w', encoding='utf-8', newline='') as f:
                 if include_metadata:
+                    # Gather statistics once for the whole header
+                    stats = self.get_statistics()
+                    
                     # Write comprehensive metadata header
                     metadata = f"""# COMPREHENSIVE FINANCIAL TRANSACTION DATA
 # This file contains all sanitized financial transactions from your bank statements.
 # Safe for AI analysis tools like NotebookLM, ChatGPT, Claude, etc.
 #
-# DATA PERIOD: {self.get_statistics().get('date_range', {}).get('min', 'Unknown')} to {self.get_statistics().get('date_range', {}).get('max', 'Unknown')}
-# TOTAL TRANSACTIONS: {self.get_statistics().get('total_transactions', 0)}
-# FILES PROCESSED: {self.get_statistics().get('files_imported', 0)}
+# DATA PERIOD: {stats.get('date_range', {}).get('min', 'Unknown')} to {stats.get('date_range', {}).get('max', 'Unknown')}
+# TOTAL TRANSACTIONS: {stats.get('total_transactions', 0)}
+# FILES PROCESSED: {stats.get('files_imported', 0)}
 #
 # COLUMNS:
 #   - transaction_date: Date of the transaction
@@ -957,24 +1693,25 @@ class DatabaseExporter:
                 fieldnames = ['transaction_date', 'amount', 'description', 'merchant_name',
                             'category', 'account_type', 'bank_name', 'transaction_type', 
                             'source_file', 'reference_number', 'notes', 'is_recurring']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for row in rows:
-                    writer.writerow({
-                        'transaction_date': row[0] or '',
-                        'amount': row[1] if row[1] is not None else '',
-                        'description': row[2] or '',
-                        'merchant_name': row[3] or '',
-                        'category': row[4] or '',
-                        'account_type': row[5] or '',
-                        'bank_name': row[6] or '',
-                        'transaction_type': row[7] or '',
-                        'source_file': row[8] or '',
-                        'reference_number': row[9] or '',
-                        'notes': row[10] or '',
-                        'is_recurring': 'Yes' if row[11] else 'No'
-                    })
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                writer.writerows(
+                    (
+                        row[0] or '',  # transaction_date
+                        row[1] if row[1] is not None else '',  # amount
+                        row[2] or '',  # description
+                        row[3] or '',  # merchant_name
+                        row[4] or '',  # category
+                        row[5] or '',  # account_type
+                        row[6] or '',  # bank_name
+                        row[7] or '',  # transaction_type
+                        row[8] or '',  # source_file
+                        row[9] or '',  # reference_number
+                        row[10] or '',  # notes
+                        'Yes' if row[11] else 'No',  # is_recurring
+                    )
+                    for row in cursor
+                )
                 
                 # Also export investment data if available (while file is still open)
                 cursor.execute("""
@@ -1015,6 +1752,9 @@ class DatabaseExporter:
                         ])
             
             return True
+        except sqlite3.OperationalError:
+            # Locked/busy databases propagate so batch callers can back off and retry
+            raise
         except Exception as e:
             print(f"Error exporting to CSV: {e}")
             return False
@@ -1026,22 +1766,24 @@ class DatabaseExporter:
             output_path: Path where the report should be saved
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful, False otherwise. sqlite3.OperationalError
+            (e.g. a locked database) is raised rather than reported.
         """
         try:
             cursor = self.conn.cursor()
             stats = self.get_statistics()
             
             # Get monthly breakdown
-            cursor.execute("""
+            month = "month_key" if HAS_GENERATED_COLUMNS else "strftime('%Y-%m', transaction_date)"
+            cursor.execute(f"""
                 SELECT 
-                    strftime('%Y-%m', transaction_date) as month,
+                    {month} as month,
                     COUNT(*) as count,
                     SUM(amount) as total
                 FROM transactions
-                WHERE transaction_date IS NOT NULL
-                GROUP BY month
-                ORDER BY month
+                WHERE {month} IS NOT NULL
+                GROUP BY {month}
+                ORDER BY {month}
             """)
             monthly_data = cursor.fetchall()
             
@@ -1059,102 +1801,134 @@ class DatabaseExporter:
             """)
             category_data = cursor.fetchall()
             
+            # Build the report in memory and write it in one call
+            lines = [
+                "=" * 80,
+                "FINANCIAL TRANSACTION SUMMARY REPORT",
+                "Safe for AI Analysis (NotebookLM, ChatGPT, Claude, etc.)",
+                "=" * 80,
+                "",
+                "OVERVIEW",
+                "-" * 80,
+                f"Total Transactions: {stats['total_transactions']}",
+                f"Files Processed: {stats['files_imported']}",
+            ]
+            if stats['date_range']['min']:
+                lines.append(f"Date Range: {stats['date_range']['min']} to {stats['date_range']['max']}")
+            if stats['total_amount']:
+                lines.append(f"Total Amount: ${stats['total_amount']:,.2f}")
+            lines.append("")
+            
+            if monthly_data:
+                lines.append("MONTHLY BREAKDOWN")
+                lines.append("-" * 80)
+                lines.extend(f"{month}: {count} transactions, Total: ${total:,.2f}" for month, count, total in monthly_data)
+                lines.append("")
+            
+            if category_data:
+                lines.append("TOP SPENDING CATEGORIES")
+                lines.append("-" * 80)
+                lines.extend(f"{category}: {count} transactions, Total: ${total:,.2f}" for category, count, total in category_data)
+                lines.append("")
+            
+            lines.extend([
+                "=" * 80,
+                "NOTE: All sensitive information has been redacted from this data.",
+                "This report is safe to share with AI tools for analysis.",
+                "=" * 80,
+                "",
+            ])
+            
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write("=" * 80 + "\n")
-                f.write("FINANCIAL TRANSACTION SUMMARY REPORT\n")
-                f.write("Safe for AI Analysis (NotebookLM, ChatGPT, Claude, etc.)\n")
-                f.write("=" * 80 + "\n\n")
-                
-                f.write("OVERVIEW\n")
-                f.write("-" * 80 + "\n")
-                f.write(f"Total Transactions: {stats['total_transactions']}\n")
-                f.write(f"Files Processed: {stats['files_imported']}\n")
-                if stats['date_range']['min']:
-                    f.write(f"Date Range: {stats['date_range']['min']} to {stats['date_range']['max']}\n")
-                if stats['total_amount']:
-                    f.write(f"Total Amount: ${stats['total_amount']:,.2f}\n")
-                f.write("\n")
-                
-                if monthly_data:
-                    f.write("MONTHLY BREAKDOWN\n")
-                    f.write("-" * 80 + "\n")
-                    for month, count, total in monthly_data:
-                        f.write(f"{month}: {count} transactions, Total: ${total:,.2f}\n")
-                    f.write("\n")
-                
-                if category_data:
-                    f.write("TOP SPENDING CATEGORIES\n")
-                    f.write("-" * 80 + "\n")
-                    for category, count, total in category_data:
-                        f.write(f"{category}: {count} transactions, Total: ${total:,.2f}\n")
-                    f.write("\n")
-                
-                f.write("=" * 80 + "\n")
-                f.write("NOTE: All sensitive information has been redacted from this data.\n")
-                f.write("This report is safe to share with AI tools for analysis.\n")
-                f.write("=" * 80 + "\n")
+                f.write("\n".join(lines))
             
             return True
+        except sqlite3.OperationalError:
+            # Locked/busy databases propagate so batch callers can back off and retry
+            raise
         except Exception as e:
             print(f"Error creating summary report: {e}")
             return False
     
-    def _detect_recurring_transactions(self):
+    def finalize_recurring(self):
+        """Run the recurring detection deferred by defer_recurring=True inserts.
+        
+        Only merchants that appear in the files inserted since the last run are
+        re-examined, so calling this once after a multi-file import avoids
+        rescanning the whole table per file.
+        """
+        if self._pending_recurring_files:
+            source_files, self._pending_recurring_files = self._pending_recurring_files, set()
+            self._update_recurring(source_files)
+    
+    def _update_recurring(self, source_files: Iterable[str], defer: bool = False):
+        """Refresh recurring flags and bills after new transactions from source_files.
+        
+        Args:
+            source_files: Source files whose transactions were just inserted
+            defer: If True, only queue the files for finalize_recurring()
+        """
+        if defer:
+            self._pending_recurring_files.update(source_files)
+            return
+        
+        try:
+            self._detect_recurring_transactions(source_files)
+            # Update bills table from recurring transactions
+            self.update_bills_from_recurring_transactions()
+        except Exception as e:
+            # Log but don't fail - recurring detection is not critical
+            print(f"Warning: Failed to detect recurring transactions: {e}")
+    
+    def _detect_recurring_transactions(self, source_files: Optional[Iterable[str]] = None):
         """Detect and mark recurring transactions (subscriptions, bills, etc.).
         
         A transaction is considered recurring if:
         - Same merchant name appears multiple times
         - Similar amount (within 5% variance)
         - Regular intervals (approximately monthly)
+        
+        Args:
+            source_files: If given, only merchants appearing in these files are
+                re-examined; others cannot have changed
         """
         cursor = self.conn.cursor()
         
-        # Find transactions with the same merchant name
+        merchant_filter = ""
+        params = []
+        if source_files is not None:
+            merchant_filter = """
+                AND merchant_name IN (
+                    SELECT merchant_name FROM transactions
+                    WHERE source_file IN (SELECT value FROM json_each(?))
+                )"""
+            params.append(json.dumps(sorted(source_files)))
+        
+        # One set-based UPDATE: merchants seen at least 3 times where at least
+        # 70% of their transactions are within 5% of the merchant's average amount
         cursor.execute("""
-            SELECT merchant_name, COUNT(*) as count, AVG(amount) as avg_amount
-            FROM transactions
-            WHERE merchant_name IS NOT NULL AND merchant_name != ''
-            GROUP BY merchant_name
-            HAVING count >= 3
-        """)
-        
-        recurring_merchants = cursor.fetchall()
-        
-        for merchant_row in recurring_merchants:
-            merchant_name = merchant_row[0]
-            avg_amount = merchant_row[2]
-            
-            # Get all transactions for this merchant
-            cursor.execute("""
-                SELECT id, transaction_date, amount
+            WITH merchant_stats AS (
+                SELECT merchant_name, COUNT(*) as count, AVG(amount) as avg_amount
                 FROM transactions
-                WHERE merchant_name = ?
-                ORDER BY transaction_date
-            """, (merchant_name,))
-            
-            transactions = cursor.fetchall()
-            
-            if len(transactions) < 3:
-                continue
-            
-            # Check if amounts are similar (within 5% of average)
-            similar_amount_count = 0
-            for trans in transactions:
-                amount = trans[2]
-                if amount and avg_amount:
-                    variance = abs(amount - avg_amount) / abs(avg_amount)
-                    if variance <= 0.05:  # Within 5%
-                        similar_amount_count += 1
-            
-            # If most transactions have similar amounts, mark as recurring
-            if similar_amount_count >= len(transactions) * 0.7:  # 70% threshold
-                cursor.execute("""
-                    UPDATE transactions
-                    SET is_recurring = 1
-                    WHERE merchant_name = ?
-                """, (merchant_name,))
-        
-        self.conn.commit()
+                WHERE merchant_name IS NOT NULL AND merchant_name != ''""" + merchant_filter + """
+                GROUP BY merchant_name
+                HAVING count >= 3
+            ),
+            recurring_merchants AS (
+                SELECT s.merchant_name
+                FROM merchant_stats s
+                JOIN transactions t ON t.merchant_name = s.merchant_name
+                GROUP BY s.merchant_name
+                -- Multiplying instead of dividing by the average needs no zero
+                -- guard: a zero average can never be within 5% of a non-zero amount
+                HAVING TOTAL(t.amount != 0 AND ABS(t.amount - s.avg_amount) <= 0.05 * ABS(s.avg_amount))
+                       >= MAX(s.count) * 0.7
+            )
+            UPDATE transactions
+            SET is_recurring = 1
+            WHERE is_recurring IS NOT 1
+            AND merchant_name IN (SELECT merchant_name FROM recurring_merchants)
+        """, params)
     
     def _detect_recurring_income(self):
         """Detect and track recurring income sources.
@@ -1314,38 +2088,37 @@ class DatabaseExporter:
         
         recurring = cursor.fetchall()
         
-        for row in recurring:
-            merchant_name = row[0]
-            category = row[1]
-            avg_amount = abs(row[2]) if row[2] else 0
-            count = row[3]
-            first_date = row[4]
-            last_date = row[5]
-            
-            # Check if bill already exists
-            cursor.execute("SELECT id FROM bills WHERE merchant_name = ?", (merchant_name,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update existing bill
-                cursor.execute("""
-                    UPDATE bills
-                    SET amount = ?,
-                        category = ?,
-                        payment_count = ?,
-                        last_paid_date = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE merchant_name = ?
-                """, (avg_amount, category, count, last_date, merchant_name))
-            else:
-                # Create new bill
-                cursor.execute("""
-                    INSERT INTO bills (merchant_name, category, amount, frequency, 
-                                     last_paid_date, payment_count, total_paid)
-                    VALUES (?, ?, ?, 'monthly', ?, ?, ?)
-                """, (merchant_name, category, avg_amount, last_date, count, avg_amount * count))
-        
-        self.conn.commit()
+        with self._transaction():
+            for row in recurring:
+                merchant_name = row[0]
+                category = row[1]
+                avg_amount = abs(row[2]) if row[2] else 0
+                count = row[3]
+                first_date = row[4]
+                last_date = row[5]
+                
+                # Check if bill already exists
+                cursor.execute("SELECT id FROM bills WHERE merchant_name = ?", (merchant_name,))
+                existing = cursor.fetchone()
+                
+                if existing:
+                    # Update existing bill
+                    cursor.execute("""
+                        UPDATE bills
+                        SET amount = ?,
+                            category = ?,
+                            payment_count = ?,
+                            last_paid_date = ?,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE merchant_name = ?
+                    """, (avg_amount, category, count, last_date, merchant_name))
+                else:
+                    # Create new bill
+                    cursor.execute("""
+                        INSERT INTO bills (merchant_name, category, amount, frequency, 
+                                         last_paid_date, payment_count, total_paid)
+                        VALUES (?, ?, ?, 'monthly', ?, ?, ?)
+                    """, (merchant_name, category, avg_amount, last_date, count, avg_amount * count))
     
     def get_upcoming_bills(self, days_ahead: int = 30) -> List[Dict[str, Any]]:
         """Get bills due in the next N days.
@@ -1437,7 +2210,8 @@ class DatabaseExporter:
             include_metadata: Whether to include metadata in the export
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful, False otherwise. sqlite3.OperationalError
+            (e.g. a locked database) is raised rather than reported.
         """
         try:
             cursor = self.conn.cursor()
@@ -1457,7 +2231,7 @@ class DatabaseExporter:
                     source_file,
                     reference_number,
                     notes,
-                    is_recurring
+                    COALESCE(is_recurring, 0) AS is_recurring
                 FROM transactions
             """
             
@@ -1470,56 +2244,56 @@ class DatabaseExporter:
                 conditions.append("transaction_date <= ?")
                 params.extend([start_date, end_date])
             
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
+            query += where + " ORDER BY transaction_date, id"
             
-            query += " ORDER BY transaction_date, id"
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            # Convert rows to dictionaries
-            transactions = []
-            for row in rows:
-                transactions.append({
-                    'id': row[0],
-                    'transaction_date': row[1],
-                    'amount': row[2],
-                    'description': row[3],
-                    'merchant_name': row[4],
-                    'category': row[5],
-                    'account_type': row[6],
-                    'bank_name': row[7],
-                    'transaction_type': row[8],
-                    'source_file': row[9],
-                    'reference_number': row[10],
-                    'notes': row[11],
-                    'is_recurring': bool(row[12]) if row[12] is not None else False
-                })
-            
-            # Build export data
-            export_data = {}
-            
-            if include_metadata:
-                stats = self.get_statistics()
-                export_data['metadata'] = {
-                    'export_date': datetime.now().isoformat(),
-                    'total_transactions': len(transactions),
-                    'date_range': {
-                        'start': date_range[0] if date_range else stats['date_range']['min'],
-                        'end': date_range[1] if date_range else stats['date_range']['max']
-                    },
-                    'files_imported': stats['files_imported'],
-                    'note': 'All sensitive information has been redacted from this data.'
-                }
-            
-            export_data['transactions'] = transactions
-            
-            # Write JSON file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            # The count in the metadata and the streamed rows come from one snapshot
+            with self._read_transaction():
+                # Build export metadata
+                metadata = None
+                if include_metadata:
+                    stats = self.get_statistics()
+                    cursor.execute("SELECT COUNT(*) FROM transactions" + where, params)
+                    metadata = {
+                        'export_date': datetime.now().isoformat(),
+                        'total_transactions': cursor.fetchone()[0],
+                        'date_range': {
+                            'start': date_range[0] if date_range else stats['date_range']['min'],
+                            'end': date_range[1] if date_range else stats['date_range']['max']
+                        },
+                        'files_imported': stats['files_imported'],
+                        'note': 'All sensitive information has been redacted from this data.'
+                    }
+                
+                # Rows are streamed from the cursor into the file in the same layout
+                # json.dump(indent=2) would produce, instead of building the whole
+                # document in memory first
+                encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write('{\n')
+                    if metadata is not None:
+                        f.write('  "metadata": ' + encoder.encode(metadata).replace('\n', '\n  ') + ',\n')
+                    
+                    f.write('  "transactions": [')
+                    cursor.row_factory = None  # Plain tuples, zipped with the column names below
+                    cursor.execute(query, params)
+                    keys = [column[0] for column in cursor.description]
+                    separator = '\n    '
+                    for row in cursor:
+                        transaction = dict(zip(keys, row))
+                        transaction['is_recurring'] = bool(transaction['is_recurring'])
+                        # Raw newlines only occur between JSON tokens, never inside strings
+                        f.write(separator + encoder.encode(transaction).replace('\n', '\n    '))
+                        separator = ',\n    '
+                    
+                    if separator != '\n    ':
+                        f.write('\n  ')
+                    f.write(']\n}')
             
             return True
+        except sqlite3.OperationalError:
+            # Locked/busy databases propagate so batch callers can back off and retry
+            raise
         except Exception as e:
             print(f"Error exporting to JSON: {e}")
             return False
@@ -1667,10 +2441,8 @@ class DatabaseExporter:
                 balance.get('bank_name'),
             ))
             
-            self.conn.commit()
             return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error inserting balance: {e}")
             return False
     
@@ -1708,7 +2480,8 @@ class DatabaseExporter:
         query += " ORDER BY statement_date DESC, id DESC"
         
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(limit)
         
         cursor.execute(query, params)
         rows = cursor.fetchall()
@@ -1812,7 +2585,9 @@ class DatabaseExporter:
                           max_amount: Optional[float] = None,
                           date_range: Optional[Tuple[str, str]] = None,
                           is_recurring: Optional[bool] = None,
-                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+                          limit: Optional[int] = None,
+                          as_dataframe: bool = False,
+                          ordered: bool = True) -> Union[List[Dict[str, Any]], pd.DataFrame]:
         """Query transactions with various filters.
         
         Args:
@@ -1825,17 +2600,105 @@ class DatabaseExporter:
             date_range: Tuple of (start_date, end_date) in YYYY-MM-DD format
             is_recurring: Filter by recurring status (True/False)
             limit: Maximum number of results to return
+            as_dataframe: If True, return a DataFrame from query_transactions_df()
+                instead, skipping the per-row dicts
+            ordered: If False, skip the newest-first ORDER BY and return rows in
+                whatever order SQLite reads them (saves a sort when the caller
+                re-sorts or aggregates anyway)
             
         Returns:
-            List of transaction dictionaries
+            List of transaction dictionaries, or a DataFrame if as_dataframe is set
+        """
+        if as_dataframe:
+            return self.query_transactions_df(category, merchant, account_type, bank_name,
+                                              min_amount, max_amount, date_range,
+                                              is_recurring, limit, ordered=ordered)
+        
+        return list(self.iter_transactions(category, merchant, account_type, bank_name,
+                                           min_amount, max_amount, date_range,
+                                           is_recurring, limit, ordered=ordered))
+    
+    def iter_transactions(self, category: Optional[str] = None,
+                          merchant: Optional[str] = None,
+                          account_type: Optional[str] = None,
+                          bank_name: Optional[str] = None,
+                          min_amount: Optional[float] = None,
+                          max_amount: Optional[float] = None,
+                          date_range: Optional[Tuple[str, str]] = None,
+                          is_recurring: Optional[bool] = None,
+                          limit: Optional[int] = None,
+                          ordered: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield transaction dictionaries one at a time.
+        
+        Takes the same filters as query_transactions(), but rows are converted
+        only as they are consumed, so a large export can be written out in
+        constant memory.
+        
+        Yields:
+            Transaction dictionaries
         """
         cursor = self.conn.cursor()
+        cursor.execute(*self._build_transaction_query(
+            category, merchant, account_type, bank_name, min_amount, max_amount,
+            date_range, is_recurring, limit, ordered
+        ))
+        
+        # Keys come from the SELECT list, so the dicts follow its column order
+        keys = [column[0] for column in cursor.description]
+        for row in cursor:
+            transaction = dict(zip(keys, row))
+            # NULLs are already folded to 0 in SQL
+            transaction['is_recurring'] = bool(transaction['is_recurring'])
+            yield transaction
+    
+    def query_transactions_df(self, category: Optional[str] = None,
+                              merchant: Optional[str] = None,
+                              account_type: Optional[str] = None,
+                              bank_name: Optional[str] = None,
+                              min_amount: Optional[float] = None,
+                              max_amount: Optional[float] = None,
+                              date_range: Optional[Tuple[str, str]] = None,
+                              is_recurring: Optional[bool] = None,
+                              limit: Optional[int] = None,
+                              ordered: bool = True) -> pd.DataFrame:
+        """Query transactions into a DataFrame, one column per field.
+        
+        Takes the same filters as query_transactions(). Rows go straight from
+        the cursor into column arrays without building a dict per row, so
+        totals and group-bys can run on the columns (e.g. df['amount'].sum()).
         
+        Returns:
+            DataFrame with the query_transactions() keys as columns
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # Plain tuples for DataFrame.from_records
+        cursor.execute(*self._build_transaction_query(
+            category, merchant, account_type, bank_name, min_amount, max_amount,
+            date_range, is_recurring, limit, ordered
+        ))
+        
+        keys = [column[0] for column in cursor.description]
+        df = pd.DataFrame.from_records(cursor.fetchall(), columns=keys)
+        df['is_recurring'] = df['is_recurring'].astype(bool)
+        return df
+    
+    def _build_transaction_query(self, category: Optional[str], merchant: Optional[str],
+                                 account_type: Optional[str], bank_name: Optional[str],
+                                 min_amount: Optional[float], max_amount: Optional[float],
+                                 date_range: Optional[Tuple[str, str]],
+                                 is_recurring: Optional[bool],
+                                 limit: Optional[int],
+                                 ordered: bool = True) -> Tuple[str, List[Any]]:
+        """Build the filtered transaction SELECT shared by the query and iter methods.
+        
+        Returns:
+            Tuple of (query, params)
+        """
         query = """
             SELECT 
                 id, transaction_date, amount, description, merchant_name,
                 category, account_type, bank_name, transaction_type, source_file, 
-                reference_number, notes, is_recurring
+                reference_number, notes, COALESCE(is_recurring, 0) AS is_recurring
             FROM transactions
             WHERE 1=1
         """
@@ -1875,33 +2738,14 @@ class DatabaseExporter:
             query += " AND is_recurring = ?"
             params.append(1 if is_recurring else 0)
         
-        query += " ORDER BY transaction_date DESC, id DESC"
+        if ordered:
+            query += " ORDER BY transaction_date DESC, id DESC"
         
         if limit:
-            query += f" LIMIT {limit}"
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+            query += " LIMIT ?"
+            params.append(limit)
         
-        transactions = []
-        for row in rows:
-            transactions.append({
-                'id': row[0],
-                'transaction_date': row[1],
-                'amount': row[2],
-                'description': row[3],
-                'merchant_name': row[4],
-                'category': row[5],
-                'account_type': row[6],
-                'bank_name': row[7],
-                'transaction_type': row[8],
-                'source_file': row[9],
-                'reference_number': row[10],
-                'notes': row[11],
-                'is_recurring': bool(row[12]) if row[12] is not None else False
-            })
-        
-        return transactions
+        return query, params
     
     def get_recurring_transactions(self) -> List[Dict[str, Any]]:
         """Get all recurring transactions grouped by merchant.
@@ -1910,53 +2754,44 @@ class DatabaseExporter:
             List of dictionaries with merchant info and transaction lists
         """
         cursor = self.conn.cursor()
+        cursor.row_factory = None  # Plain tuples; rows are only read by position
         
+        # One query for every recurring transaction, grouped by merchant here
+        # instead of issuing a follow-up SELECT per merchant
         cursor.execute("""
-            SELECT 
-                merchant_name,
-                COUNT(*) as count,
-                AVG(amount) as avg_amount,
-                MIN(transaction_date) as first_date,
-                MAX(transaction_date) as last_date,
-                SUM(amount) as total_amount
+            SELECT merchant_name, id, transaction_date, amount, description
             FROM transactions
             WHERE is_recurring = 1 AND merchant_name IS NOT NULL
-            GROUP BY merchant_name
-            ORDER BY count DESC
+            ORDER BY merchant_name, transaction_date DESC
         """)
         
-        recurring = cursor.fetchall()
-        
         result = []
-        for row in recurring:
-            # Get individual transactions for this merchant
-            cursor.execute("""
-                SELECT id, transaction_date, amount, description
-                FROM transactions
-                WHERE merchant_name = ? AND is_recurring = 1
-                ORDER BY transaction_date DESC
-            """, (row[0],))
-            
-            transactions = cursor.fetchall()
+        for merchant_name, rows in itertools.groupby(cursor, key=operator.itemgetter(0)):
+            rows = list(rows)
+            transactions = [
+                {
+                    'id': row[1],
+                    'transaction_date': row[2],
+                    'amount': row[3],
+                    'description': row[4]
+                }
+                for row in rows
+            ]
+            amounts = [row[3] for row in rows if row[3] is not None]
+            dates = [row[2] for row in rows if row[2] is not None]
             
+            # Same NULL handling as the SQL aggregates (COUNT(*), AVG, SUM, MIN, MAX)
             result.append({
-                'merchant_name': row[0],
-                'transaction_count': row[1],
-                'average_amount': row[2],
-                'first_transaction': row[3],
-                'last_transaction': row[4],
-                'total_amount': row[5],
-                'transactions': [
-                    {
-                        'id': t[0],
-                        'transaction_date': t[1],
-                        'amount': t[2],
-                        'description': t[3]
-                    }
-                    for t in transactions
-                ]
+                'merchant_name': merchant_name,
+                'transaction_count': len(transactions),
+                'average_amount': sum(amounts) / len(amounts) if amounts else None,
+                'first_transaction': min(dates) if dates else None,
+                'last_transaction': max(dates) if dates else None,
+                'total_amount': sum(amounts) if amounts else None,
+                'transactions': transactions
             })
         
+        result.sort(key=operator.itemgetter('transaction_count'), reverse=True)
         return result
     
     def extract_tax_document_from_text(self, text: str, source_file: str) -> Optional[Dict[str, Any]]:
@@ -2030,10 +2865,8 @@ class DatabaseExporter:
             ))
             
             doc_id = cursor.lastrowid
-            self.conn.commit()
             return doc_id
         except Exception as e:
-            self.conn.rollback()
             print(f"Error inserting tax document: {e}")
             return None
     
@@ -2112,10 +2945,8 @@ class DatabaseExporter:
                 paystub.get('ytd_taxes'),
             ))
             
-            self.conn.commit()
             return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error inserting paystub: {e}")
             return False
     
@@ -2236,7 +3067,6 @@ class DatabaseExporter:
                 VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
             """, (category, month, year, amount))
             
-            self.conn.commit()
             return True
         except Exception as e:
             print(f"Error setting budget: {e}")
@@ -2436,7 +3266,6 @@ class DatabaseExporter:
             """, (goal_name, goal_type, target_amount, target_date, start_date, description))
             
             goal_id = cursor.lastrowid
-            self.conn.commit()
             return goal_id
         except Exception as e:
             print(f"Error setting financial goal: {e}")
@@ -2460,7 +3289,6 @@ class DatabaseExporter:
                 WHERE id = ?
             """, (current_amount, goal_id))
             
-            self.conn.commit()
             return True
         except Exception as e:
             print(f"Error updating goal progress: {e}")
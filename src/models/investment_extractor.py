@@ -3,6 +3,7 @@ Investment Account Extractor
 Extracts investment account data from statements (portfolio value, holdings, transactions).
 """
 
+import io
 import re
 from datetime import datetime
 from typing import Dict, Optional, Any, List
@@ -245,7 +246,8 @@ class InvestmentExtractor:
             List of transaction dictionaries
         """
         transactions = []
-        lines = text.split('\n')
+        # Stream lines instead of materializing a list of every line in the statement
+        lines = io.StringIO(text)
         
         # Date pattern
         date_pattern = re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}')
@@ -253,6 +255,7 @@ class InvestmentExtractor:
         current_date = statement_date
         
         for line in lines:
+            line = line.rstrip('\n')
             line_lower = line.lower()
             
             # Update current date if found
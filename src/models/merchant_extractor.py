@@ -4,8 +4,16 @@ Extracts clean merchant names from transaction descriptions.
 """
 
 import re
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Iterable
 
+# Per-description patterns used by MerchantExtractor.extract(), compiled once
+CAPS_WORDS_PATTERN = re.compile(r'\b([A-Z]{2,}(?:\s+[A-Z]{2,})*)\b')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+CORPORATE_SUFFIX_PATTERN = re.compile(r'\s+(LLC|INC|CORP|LTD|CO)\.?$', re.IGNORECASE)
+
+# Used to tell whether a mapping pattern has lowercase letters outside its escapes
+ESCAPE_SEQUENCE_PATTERN = re.compile(r'\\.')
+LOWERCASE_LETTER_PATTERN = re.compile(r'[a-z]')
 
 class MerchantExtractor:
     """Extracts merchant names from transaction descriptions."""
@@ -303,7 +311,7 @@ class MerchantExtractor:
         # Compile patterns for faster matching
         self.compiled_mappings = {}
         for pattern, merchant in self.merchant_mappings.items():
-            self.compiled_mappings[pattern] = (re.compile(pattern, re.IGNORECASE), merchant)
+            self.compiled_mappings[pattern] = (self._compile_mapping(pattern), merchant)
         
         # Patterns to remove from descriptions
         self.cleanup_patterns = [
@@ -333,9 +341,10 @@ class MerchantExtractor:
         if not description:
             return None
         
-        # First, check known merchant mappings
+        # First, check known merchant mappings (compiled to match upper-cased text)
+        upper_description = description.upper()
         for pattern, (compiled_pattern, merchant_name) in self.compiled_mappings.items():
-            if compiled_pattern.search(description):
+            if compiled_pattern.search(upper_description):
                 return merchant_name
         
         # Try to extract merchant name by cleaning up the description
@@ -347,11 +356,11 @@ class MerchantExtractor:
         
         # Extract the first meaningful word/phrase (usually the merchant)
         # Look for words in ALL CAPS (common in bank statements)
-        caps_match = re.search(r'\b([A-Z]{2,}(?:\s+[A-Z]{2,})*)\b', cleaned)
+        caps_match = CAPS_WORDS_PATTERN.search(cleaned)
         if caps_match:
             merchant = caps_match.group(1).strip()
             # Clean up further
-            merchant = re.sub(r'\s+', ' ', merchant)  # Normalize spaces
+            merchant = WHITESPACE_PATTERN.sub(' ', merchant)  # Normalize spaces
             if len(merchant) > 2:  # Only return if meaningful
                 return merchant.title()  # Convert to Title Case
         
@@ -361,12 +370,28 @@ class MerchantExtractor:
             # Take first 2-3 words as merchant name
             merchant = ' '.join(words[:3]).strip()
             # Remove common suffixes
-            merchant = re.sub(r'\s+(LLC|INC|CORP|LTD|CO)\.?$', '', merchant, flags=re.IGNORECASE)
+            merchant = CORPORATE_SUFFIX_PATTERN.sub('', merchant)
             if len(merchant) > 2:
                 return merchant.title()
         
         return None
     
+    def extract_batch(self, descriptions: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """Extract merchant names for many descriptions at once.
+        
+        Each distinct description is extracted only once, since statements
+        repeat the same merchant lines.
+        
+        Args:
+            descriptions: Transaction description texts
+            
+        Returns:
+            Merchant names in the same order as descriptions
+        """
+        descriptions = list(descriptions)
+        merchants = {description: self.extract(description) for description in set(descriptions)}
+        return [merchants[description] for description in descriptions]
+    
     def add_merchant_mapping(self, pattern: str, merchant_name: str):
         """Add a custom merchant name mapping.
         
@@ -375,5 +400,23 @@ class MerchantExtractor:
             merchant_name: Name to return when pattern matches
         """
         self.merchant_mappings[pattern] = merchant_name
-        self.compiled_mappings[pattern] = (re.compile(pattern, re.IGNORECASE), merchant_name)
+        self.compiled_mappings[pattern] = (self._compile_mapping(pattern), merchant_name)
+    
+    @staticmethod
+    def _compile_mapping(pattern: str):
+        """Compile a merchant mapping pattern for matching against upper-cased text.
+        
+        re.IGNORECASE turns off the regex engine's literal fast paths, so patterns
+        written in upper case are compiled without it; patterns containing
+        lowercase letters keep it.
+        
+        Args:
+            pattern: Regex pattern from the merchant mappings
+            
+        Returns:
+            Compiled pattern
+        """
+        if LOWERCASE_LETTER_PATTERN.search(ESCAPE_SEQUENCE_PATTERN.sub('', pattern)):
+            return re.compile(pattern, re.IGNORECASE)
+        return re.compile(pattern)
 
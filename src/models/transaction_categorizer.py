@@ -4,7 +4,7 @@ Automatically categorizes transactions based on description keywords.
 """
 
 import re
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterable
 
 
 class TransactionCategorizer:
@@ -198,12 +198,14 @@ class TransactionCategorizer:
             ]
         }
         
-        # Compile regex patterns for faster matching
+        # Compile regex patterns for faster matching. Descriptions are lower-cased
+        # before matching, so the keywords are too and re.IGNORECASE (which turns
+        # off the regex engine's literal fast paths) is not needed
         self.compiled_patterns = {}
         for category, keywords in self.category_rules.items():
             # Create a regex pattern that matches any of the keywords
-            pattern = '|'.join(re.escape(keyword) for keyword in keywords)
-            self.compiled_patterns[category] = re.compile(pattern, re.IGNORECASE)
+            pattern = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+            self.compiled_patterns[category] = re.compile(pattern)
     
     def categorize(self, description: str) -> Optional[str]:
         """Categorize a transaction based on its description.
@@ -226,6 +228,22 @@ class TransactionCategorizer:
         
         return None
     
+    def categorize_batch(self, descriptions: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """Categorize many transactions at once.
+        
+        Each distinct description is categorized only once, since statements
+        repeat the same merchant lines.
+        
+        Args:
+            descriptions: Transaction description texts
+            
+        Returns:
+            Category names in the same order as descriptions
+        """
+        descriptions = list(descriptions)
+        categories = {description: self.categorize(description) for description in set(descriptions)}
+        return [categories[description] for description in descriptions]
+    
     def get_all_categories(self) -> List[str]:
         """Get list of all available categories.
         
@@ -242,6 +260,6 @@ class TransactionCategorizer:
             keywords: List of keywords to match for this category
         """
         self.category_rules[category] = keywords
-        pattern = '|'.join(re.escape(keyword) for keyword in keywords)
-        self.compiled_patterns[category] = re.compile(pattern, re.IGNORECASE)
+        pattern = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+        self.compiled_patterns[category] = re.compile(pattern)
 
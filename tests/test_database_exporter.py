@@ -0,0 +1,188 @@
+"""
+Regression tests for DatabaseExporter transaction handling.
+"""
+
+import pandas as pd
+import pytest
+
+from src.models import database_exporter
+from src.models.database_exporter import DatabaseExporter, TRANSACTION_FIELDS
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    """Exporter connected to a fresh on-disk database."""
+    db = DatabaseExporter(str(tmp_path / 'finance.db'))
+    assert db.connect()
+    db.create_schema()
+    yield db
+    db.close()
+
+
+def make_transaction(**overrides):
+    """Build a transaction dict with every TRANSACTION_FIELDS key."""
+    transaction = dict.fromkeys(TRANSACTION_FIELDS)
+    transaction.update({
+        'source_file': 'statement.csv',
+        'transaction_date': '2024-01-15',
+        'amount': -12.5,
+        'description': 'COFFEE SHOP',
+        'is_recurring': 0,
+    })
+    transaction.update(overrides)
+    return transaction
+
+
+def count_transactions(exporter):
+    return exporter.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+
+def test_rolled_back_batch_discards_dataframe_inserts(exporter):
+    transactions_df = pd.DataFrame([
+        make_transaction(description=f'PURCHASE {i}') for i in range(3)
+    ])
+    
+    exporter.begin_batch()
+    result = exporter.insert_transactions_df(transactions_df, defer_recurring=True)
+    assert result == {'inserted': 3, 'skipped': 0}
+    # The insert must not have committed the batch on its own
+    assert exporter.conn.in_transaction
+    exporter.record_file_import('statement.csv', 'csv', 3)
+    exporter.end_batch(commit=False)
+    
+    assert count_transactions(exporter) == 0
+    assert not exporter.is_file_imported('statement.csv')
+
+
+def test_statistics_reflect_rolled_back_batch(exporter, monkeypatch):
+    # Only the transaction totals are under test here
+    monkeypatch.setattr(exporter, 'get_bank_statistics', lambda: {})
+    monkeypatch.setattr(exporter, 'get_investment_statistics', lambda: {}, raising=False)
+    
+    exporter.begin_batch()
+    exporter.insert_transactions([make_transaction()], defer_recurring=True)
+    assert exporter.get_statistics()['total_transactions'] == 1
+    exporter.end_batch(commit=False)
+    
+    assert count_transactions(exporter) == 0
+    assert exporter.get_statistics()['total_transactions'] == 0
+
+
+def monthly_charges(source_file, merchant='Netflix', amount=-15.99):
+    return [
+        make_transaction(source_file=source_file, transaction_date=f'2024-{month:02d}-05',
+                         amount=amount, description=f'{merchant.upper()} {month}',
+                         merchant_name=merchant)
+        for month in range(1, 4)
+    ]
+
+
+def recurring_flags(exporter):
+    return [row[0] for row in exporter.conn.execute("SELECT is_recurring FROM transactions ORDER BY id")]
+
+
+def test_import_batch_commits_recurring_flags(exporter):
+    exporter.begin_batch()
+    exporter.insert_transactions(monthly_charges('statement.csv'))
+    exporter.end_batch()
+    
+    assert recurring_flags(exporter) == [1, 1, 1]
+
+
+def test_deferred_recurring_detection_runs_on_finalize(exporter):
+    exporter.insert_transactions(monthly_charges('january.csv')[:2], defer_recurring=True)
+    exporter.insert_transactions(monthly_charges('march.csv')[2:], defer_recurring=True)
+    assert recurring_flags(exporter) == [0, 0, 0]
+    
+    exporter.finalize_recurring()
+    
+    assert recurring_flags(exporter) == [1, 1, 1]
+
+
+def test_exact_duplicates_are_skipped(exporter):
+    transactions_df = pd.DataFrame([make_transaction(), make_transaction()])
+    
+    result = exporter.insert_transactions_df(transactions_df)
+    
+    assert result == {'inserted': 1, 'skipped': 1}
+    assert count_transactions(exporter) == 1
+
+
+def test_other_constraint_errors_are_not_swallowed(exporter, capsys):
+    rows = [tuple(make_transaction(source_file=None).values())]
+    
+    result = exporter.insert_transaction_rows(rows)
+    
+    # Reported as a failed insert, not silently counted as a skipped duplicate
+    assert result == {'inserted': 0, 'skipped': 0}
+    assert 'NOT NULL constraint failed' in capsys.readouterr().out
+    assert count_transactions(exporter) == 0
+
+
+@pytest.mark.parametrize('has_generated_columns', [True, False])
+def test_summary_report_groups_months(tmp_path, monkeypatch, has_generated_columns):
+    # False stands in for SQLite older than 3.31, which has no generated columns
+    monkeypatch.setattr(database_exporter, 'HAS_GENERATED_COLUMNS', has_generated_columns)
+    with DatabaseExporter(str(tmp_path / 'finance.db')) as db:
+        db.create_schema()
+        db.insert_transactions(monthly_charges('statement.csv'))
+        monkeypatch.setattr(db, 'get_statistics', lambda: {
+            'total_transactions': 3, 'files_imported': 0,
+            'date_range': {'min': None, 'max': None}, 'total_amount': 0,
+        })
+        
+        assert db.export_summary_report(str(tmp_path / 'summary.txt'))
+    
+    report = (tmp_path / 'summary.txt').read_text(encoding='utf-8')
+    assert '2024-01: 1 transactions, Total: $-15.99' in report
+    assert '2024-03: 1 transactions, Total: $-15.99' in report
+
+
+def test_legacy_date_colliding_with_iso_twin_is_removed(exporter):
+    # Stored before dates were normalized, next to the same row stored since
+    legacy = make_transaction(transaction_date='01/15/2024')
+    exporter.conn.execute("PRAGMA user_version = 0")
+    exporter.conn.executemany(
+        "INSERT INTO transactions (source_file, transaction_date, amount, description) VALUES (?, ?, ?, ?)",
+        [(legacy['source_file'], date, legacy['amount'], legacy['description'])
+         for date in ('01/15/2024', '2024-01-15', '02/01/2024')]
+    )
+    
+    exporter.create_schema()
+    
+    dates = [row[0] for row in exporter.conn.execute("SELECT transaction_date FROM transactions ORDER BY id")]
+    assert dates == ['2024-01-15', '2024-02-01']
+    assert exporter.conn.execute("PRAGMA user_version").fetchone()[0] == 1
+
+
+def test_extracted_descriptions_match_stored_length(exporter):
+    rows = [{'date': '01/15/2024', 'amount': '-12.50', 'description': 'X' * 600}]
+    
+    from_rows = exporter.extract_transactions_from_csv(rows, 'statement.csv')
+    from_df = exporter.build_transactions_dataframe(pd.DataFrame(rows, dtype=str), 'statement.csv')
+    
+    assert len(from_rows[0]['description']) == 500
+    assert len(from_df['description'][0]) == 500
+
+
+def test_batch_inside_transaction_leaves_outer_transaction_open(exporter):
+    with exporter._transaction():
+        exporter.insert_transactions([make_transaction(description='KEPT')])
+        exporter.begin_batch()
+        exporter.insert_transactions([make_transaction(description='DISCARDED')])
+        exporter.end_batch(commit=False)
+        assert exporter.conn.in_transaction
+    
+    descriptions = [row[0] for row in exporter.conn.execute("SELECT description FROM transactions")]
+    assert descriptions == ['KEPT']
+
+
+def test_nested_batch_commit_is_undone_by_outer_rollback(exporter):
+    exporter.begin_batch()
+    exporter.begin_batch()
+    exporter.insert_transactions([make_transaction()])
+    exporter.end_batch()
+    assert exporter.conn.in_transaction
+    exporter.end_batch(commit=False)
+    
+    assert count_transactions(exporter) == 0